@@ -1,6 +1,11 @@
 import csv
-import requests
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 GITHUB_TOKEN = input("Enter your GitHub Personal Access Token: ").strip()
 REPO = "Ziggler01/AML-LexisNexis-Anomaly"
@@ -11,12 +16,23 @@ HEADERS = {
     "Accept": "application/vnd.github+json"
 }
 
+# One pooled session: reuse TCP+TLS connections instead of a fresh handshake per call
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=1, status_forcelist=[502, 503, 504]),
+))
+
+MAX_WORKERS = 8
+
 def get_milestone_map():
     """Fetch all milestones and return a mapping title -> number."""
     milestones = {}
     page = 1
     while True:
-        r = requests.get(f"{API_BASE}/milestones?state=all&page={page}", headers=HEADERS)
+        r = SESSION.get(f"{API_BASE}/milestones?state=all&page={page}")
         r.raise_for_status()
         data = r.json()
         if not data:
@@ -41,7 +57,11 @@ def create_issue(row, milestone_map):
     if milestone_num:
         issue["milestone"] = milestone_num
 
-    resp = requests.post(f"{API_BASE}/issues", json=issue, headers=HEADERS)
+    resp = SESSION.post(f"{API_BASE}/issues", json=issue)
+    if resp.status_code == 403 and "Retry-After" in resp.headers:
+        # GitHub secondary rate limit: back off and retry once
+        time.sleep(int(resp.headers["Retry-After"]))
+        resp = SESSION.post(f"{API_BASE}/issues", json=issue)
     if resp.status_code == 201:
         print(f"✅ Created: {title}")
     else:
@@ -53,11 +73,20 @@ def main():
 
     with open("github_issues_phase1.csv", newline="", encoding="utf-8") as csvfile:
         reader = csv.DictReader(csvfile)
-        for row in reader:
-            milestone = row.get("Milestone", "").strip()
-            if milestone and milestone not in milestone_map:
-                print(f"⚠️ Milestone '{milestone}' not found for issue '{row['Title']}'. Issue will be created without a milestone.")
-            create_issue(row, milestone_map)
+        rows = list(reader)
+
+    for row in rows:
+        milestone = row.get("Milestone", "").strip()
+        if milestone and milestone not in milestone_map:
+            print(f"⚠️ Milestone '{milestone}' not found for issue '{row['Title']}'. Issue will be created without a milestone.")
+
+    # Creation is network-bound; a small thread pool hides the per-request RTT
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        futures = [pool.submit(create_issue, row, milestone_map) for row in rows]
+        # surface worker exceptions (connection errors etc.) instead of
+        # dropping them with the future
+        for fut in futures:
+            fut.result()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
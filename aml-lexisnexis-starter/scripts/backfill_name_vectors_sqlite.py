@@ -23,16 +23,19 @@ def main():
     db = pathlib.Path(args.db)
     con = sqlite3.connect(db)
     con.row_factory = sqlite3.Row
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
 
-    # Pick rows missing vectors
+    # Pick rows missing vectors (vectors live in the entity_vectors side table)
     rows = con.execute("""
-        SELECT entity_id, primary_name, normalized_name
-          FROM entities
-         WHERE name_vec IS NULL
+        SELECT e.entity_id, e.primary_name, e.normalized_name
+          FROM entities e
+          LEFT JOIN entity_vectors v ON v.entity_id = e.entity_id
+         WHERE v.entity_id IS NULL
     """).fetchall()
 
     if not rows:
-        print("No rows to backfill (name_vec already present).")
+        print("No rows to backfill (vectors already present).")
         con.close(); return 0
 
     print(f"Backfilling {len(rows)} entities...")
@@ -44,15 +47,19 @@ def main():
             nm = r["normalized_name"] or r["primary_name"] or ""
             nm = norm_for_matching(nm)
             names.append(nm)
-        vecs = encode_names(names)  # (N, D) float32 L2-normalized
+        vecs = np.ascontiguousarray(encode_names(names))  # (N, D) float32 L2-normalized
 
-        # Write
+        # Batch write: one prepared statement, one transaction, no per-row astype
+        # (encode_names already returns float32; slice the batch matrix directly)
+        params = [
+            (chunk[j]["entity_id"], args.model, vecs[j].tobytes())
+            for j in range(len(chunk))
+        ]
         with con:
-            for r, vec in zip(chunk, vecs):
-                con.execute(
-                    "UPDATE entities SET name_vec=?, name_vec_model=COALESCE(?, name_vec_model) WHERE entity_id=?",
-                    (vec.astype("float32").tobytes(), args.model, r["entity_id"])
-                )
+            con.executemany(
+                "INSERT OR REPLACE INTO entity_vectors(entity_id, model, vec) VALUES (?,?,?)",
+                params,
+            )
         print(f"  {min(i+B, len(rows))}/{len(rows)}")
 
     con.close()
@@ -8,32 +8,40 @@ def main():
     ap.add_argument("--db", default="data/external/sanctions/kb.sqlite")
     ap.add_argument("--out-index", default="data/external/sanctions/faiss_name.index")
     ap.add_argument("--out-ids", default="data/external/sanctions/faiss_entity_ids.npy")
+    ap.add_argument("--hnsw-threshold", type=int, default=200_000,
+                    help="Catalog size above which an HNSW index is built instead of flat")
     args = ap.parse_args()
 
     import faiss  # type: ignore
 
     con = sqlite3.connect(args.db)
     con.row_factory = sqlite3.Row
-    rows = con.execute("SELECT entity_id, name_vec FROM entities WHERE name_vec IS NOT NULL").fetchall()
+    rows = con.execute("SELECT entity_id, vec AS name_vec FROM entity_vectors").fetchall()
     con.close()
 
     if not rows:
         print("No vectors found; run backfill first.")
         return 1
 
-    # Load blobs to matrix
-    vecs = []
-    ids = []
-    for r in rows:
-        blob = r["name_vec"]
-        v = np.frombuffer(blob, dtype=np.float32)
-        vecs.append(v)
-        ids.append(r["entity_id"])
-    X = np.vstack(vecs).astype("float32")
-    d = X.shape[1]
-
-    # IndexFlatIP because vectors are L2-normalized => cosine == dot
-    index = faiss.IndexFlatIP(d)
+    # Decode blobs straight into one pre-allocated matrix (no per-row arrays,
+    # no O(N) vstack copy)
+    N = len(rows)
+    d = len(rows[0]["name_vec"]) // 4  # float32 bytes
+    X = np.empty((N, d), dtype=np.float32)
+    ids = np.empty(N, dtype=np.int64)
+    for i, r in enumerate(rows):
+        X[i] = np.frombuffer(r["name_vec"], dtype=np.float32)
+        ids[i] = r["entity_id"]
+    del rows
+
+    # Vectors are L2-normalized => cosine == dot (inner product metric).
+    # Small catalogs: exact brute force. Large catalogs: HNSW graph for
+    # sublinear queries at the same metric (search path is unchanged).
+    if len(ids) >= args.hnsw_threshold:
+        index = faiss.IndexHNSWFlat(d, 32, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = 200
+    else:
+        index = faiss.IndexFlatIP(d)
     index.add(X)
 
     # Persist
@@ -0,0 +1,64 @@
+# scripts/export_vector_matrix.py
+from __future__ import annotations
+import argparse, os, sqlite3
+import numpy as np
+
+from aml.sanctions.features_embed import quantize_int8_sym, save_kb_vectors
+
+
+def main():
+    ap = argparse.ArgumentParser(
+        description="Export entity_vectors blobs to one contiguous .npy matrix "
+                    "plus an entity_vec_index row map for mmap'd scoring")
+    ap.add_argument("--db", default="data/external/sanctions/kb.sqlite")
+    ap.add_argument("--out-matrix", default=None,
+                    help="defaults to <db>.name_vecs.npy next to the DB")
+    ap.add_argument("--int8", action="store_true",
+                    help="also write symmetric int8 codes + per-vector scales "
+                         "(4x smaller; screen() prefers them when present)")
+    args = ap.parse_args()
+
+    out = args.out_matrix or os.path.splitext(args.db)[0] + ".name_vecs.npy"
+
+    con = sqlite3.connect(args.db)
+    rows = con.execute(
+        "SELECT entity_id, vec FROM entity_vectors ORDER BY entity_id").fetchall()
+    if not rows:
+        print("No vectors found; run backfill first.")
+        con.close()
+        return 1
+
+    # Decode blobs straight into one pre-allocated matrix (same idiom as
+    # build_faiss_index.py): SoA layout, no per-row arrays
+    N = len(rows)
+    d = len(rows[0][1]) // 4  # float32 bytes
+    X = np.empty((N, d), dtype=np.float32)
+    for i, (_, blob) in enumerate(rows):
+        X[i] = np.frombuffer(blob, dtype=np.float32)
+    save_kb_vectors(out, X)
+
+    if args.int8:
+        q, scales = quantize_int8_sym(X)
+        stem = os.path.splitext(out)[0]
+        np.save(stem + ".int8.npy", q)
+        np.save(stem + ".scales.npy", scales)
+        print(f"Wrote int8 codes + scales: {stem}.int8.npy / {stem}.scales.npy")
+
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS entity_vec_index (
+          entity_id INTEGER PRIMARY KEY,
+          row_idx INTEGER NOT NULL
+        ) WITHOUT ROWID
+    """)
+    with con:
+        con.execute("DELETE FROM entity_vec_index")
+        con.executemany("INSERT INTO entity_vec_index VALUES (?,?)",
+                        ((r[0], i) for i, r in enumerate(rows)))
+    con.close()
+    print(f"Wrote {N}x{d} matrix: {out}")
+    print("Updated entity_vec_index (entity_id -> row_idx)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
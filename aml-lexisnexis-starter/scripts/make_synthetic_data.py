@@ -8,6 +8,7 @@
 # Optional: --write-extensionless to also write "trasaction.2" and "lexisnexis.2"
 
 import os, sys, argparse, random, csv
+from collections import Counter
 from datetime import datetime, timedelta
 import numpy as np
 import pandas as pd
@@ -35,8 +36,9 @@ def _norm_cols(cols):
 
 def infer_txn_stats(ref_txn_path, chunksize=250_000):
     """Scan transactions.csv in chunks and build simple distributions."""
-    cat_counts = {k: {} for k in ["currency","channel","counterparty_country","mcc"]}
-    amounts = []
+    cat_counts = {k: Counter() for k in ["currency","channel","counterparty_country","mcc"]}
+    amount_sample = np.empty(1_000_000, dtype=np.float64)  # bounded reservoir
+    n_amounts = 0
     tmin, tmax = None, None
 
     use_cols = ["txn_id","customer_id","account_id","datetime","amount","currency","channel",
@@ -47,10 +49,11 @@ def infer_txn_stats(ref_txn_path, chunksize=250_000):
         # Cast amount
         if "amount" in chunk.columns:
             amt = pd.to_numeric(chunk["amount"], errors="coerce").dropna()
-            if not amt.empty:
-                # reservoir-like sampling to limit memory
-                if len(amounts) < 1_000_000:
-                    amounts.extend(amt.values.tolist()[: max(0, 1_000_000 - len(amounts))])
+            if not amt.empty and n_amounts < amount_sample.size:
+                # copy straight into the pre-allocated buffer (no float boxing)
+                take = min(len(amt), amount_sample.size - n_amounts)
+                amount_sample[n_amounts:n_amounts+take] = amt.to_numpy()[:take]
+                n_amounts += take
         # datetime range
         if "datetime" in chunk.columns:
             dt = pd.to_datetime(chunk["datetime"], errors="coerce")
@@ -58,18 +61,17 @@ def infer_txn_stats(ref_txn_path, chunksize=250_000):
                 cmin, cmax = dt.min(), dt.max()
                 tmin = cmin if tmin is None or (pd.notna(cmin) and cmin < tmin) else tmin
                 tmax = cmax if tmax is None or (pd.notna(cmax) and cmax > tmax) else tmax
-        # categories
+        # categories (Counter.update merges the value_counts dict in C)
         for col in cat_counts:
             if col in chunk.columns:
                 s = chunk[col].astype(str).str.strip()
                 s = s.replace({"": "NA"})
-                vc = s.value_counts()
-                for k, v in vc.items():
-                    cat_counts[col][k] = cat_counts[col].get(k, 0) + int(v)
+                cat_counts[col].update(s.value_counts().to_dict())
 
     # Fallbacks
-    if not amounts:
-        amounts = [1000, 5000, 10000, 25000, 50000]
+    amounts = amount_sample[:n_amounts]
+    if amounts.size == 0:
+        amounts = np.array([1000, 5000, 10000, 25000, 50000], dtype=float)
     if tmin is None or tmax is None:
         tmin, tmax = pd.Timestamp("2025-01-01"), pd.Timestamp("2025-12-31")
 
@@ -174,58 +176,85 @@ def rand_date(start, end):
     r = random.random() * delta
     return start + timedelta(seconds=r)
 
-def synthesize_lexisnexis(n_customers, ln_stats, out_xml_path):
+_LN_CUSTOMER_TMPL = (
+    "  <customer>\n"
+    "    <customer_id>{cid}</customer_id>\n"
+    "    <pep_flag>{pep}</pep_flag>\n"
+    "    <sanctions_flag>{sanc}</sanctions_flag>\n"
+    "    <adverse_media_score>{ams}</adverse_media_score>\n"
+    "    <risk_rating>{rr}</risk_rating>\n"
+    "    <kyc_last_review_date>{kyc}</kyc_last_review_date>\n"
+    "  </customer>\n"
+)
+
+def synthesize_lexisnexis(n_customers, ln_stats, out_xml_path, block=10_000):
     os.makedirs(os.path.dirname(out_xml_path), exist_ok=True)
+    N = n_customers
+    # draw all attributes up front as arrays (no per-row RNG calls)
+    peps = (np.random.rand(N) < ln_stats["pep_p"]).astype(int)
+    sancs = (np.random.rand(N) < ln_stats["sanc_p"]).astype(int)
+    ams = np.random.choice(ln_stats["ams_vals"], N).astype(int) if ln_stats["ams_vals"].size else np.zeros(N, dtype=int)
+    rrs = np.random.choice(ln_stats["rr_keys"], N, p=ln_stats["rr_probs"]).astype(int)
+    kyc_span_days = max(1, (ln_stats["kyc_max"] - ln_stats["kyc_min"]).days)
+    kyc = ln_stats["kyc_min"].to_datetime64() + (np.random.rand(N) * kyc_span_days).astype("timedelta64[D]")
+    kyc_strs = np.datetime_as_string(kyc, unit="D")
+
     with open(out_xml_path, "w", encoding="utf-8", newline="") as f:
         f.write("<root>\n")
-        for i in range(1, n_customers+1):
-            cid = f"C{i:07d}"
-            pep = 1 if random.random() < ln_stats["pep_p"] else 0
-            sanc = 1 if random.random() < ln_stats["sanc_p"] else 0
-            ams = float(np.random.choice(ln_stats["ams_vals"])) if ln_stats["ams_vals"].size else 0.0
-            rr = int(np.random.choice(ln_stats["rr_keys"], p=ln_stats["rr_probs"]))
-            kyc_dt = rand_date(ln_stats["kyc_min"].to_pydatetime(), ln_stats["kyc_max"].to_pydatetime()).date()
-            f.write(
-                "  <customer>\n"
-                f"    <customer_id>{cid}</customer_id>\n"
-                f"    <pep_flag>{pep}</pep_flag>\n"
-                f"    <sanctions_flag>{sanc}</sanctions_flag>\n"
-                f"    <adverse_media_score>{int(ams)}</adverse_media_score>\n"
-                f"    <risk_rating>{rr}</risk_rating>\n"
-                f"    <kyc_last_review_date>{kyc_dt}</kyc_last_review_date>\n"
-                "  </customer>\n"
-            )
+        # render in blocks and write each block with a single bulk join
+        for lo in range(0, N, block):
+            hi = min(lo + block, N)
+            frags = [
+                _LN_CUSTOMER_TMPL.format(
+                    cid=f"C{i+1:07d}", pep=peps[i], sanc=sancs[i],
+                    ams=ams[i], rr=rrs[i], kyc=kyc_strs[i],
+                )
+                for i in range(lo, hi)
+            ]
+            f.write("".join(frags))
         f.write("</root>\n")
 
-def synthesize_transactions(n_txn, txn_stats, out_csv_path, customers, accounts_per_customer=(1,3)):
+def synthesize_transactions(n_txn, txn_stats, out_csv_path, customers, accounts_per_customer=(1,3), block=1_000_000):
     os.makedirs(os.path.dirname(out_csv_path), exist_ok=True)
-    # choose accounts per customer
-    acct_map = {}
-    for cid in customers:
-        n_accts = random.randint(accounts_per_customer[0], accounts_per_customer[1])
-        acct_map[cid] = [f"A{cid[1:]}_{j}" for j in range(1, n_accts+1)]
-
-    # category choices
-    def sampler(key):
+    customers = np.asarray(customers)
+    # accounts per customer (count only; account ids are built vectorized below)
+    n_accts = np.random.randint(accounts_per_customer[0], accounts_per_customer[1] + 1, size=len(customers))
+
+    # vectorized category sampler
+    def sample_col(key, size):
         keys, probs = txn_stats["cats"].get(key, (["NA"], np.array([1.0])))
-        return np.random.choice(keys, p=probs)
-
-    with open(out_csv_path, "w", encoding="utf-8", newline="") as f:
-        w = csv.writer(f)
-        w.writerow(["txn_id","customer_id","account_id","datetime","amount","currency","channel",
-                    "counterparty_id","counterparty_country","mcc","description"])
-        for i in range(1, n_txn+1):
-            cid = random.choice(customers)
-            aid = random.choice(acct_map[cid])
-            ts = rand_date(txn_stats["tmin"].to_pydatetime(), txn_stats["tmax"].to_pydatetime())
-            amt = float(np.random.choice(txn_stats["amounts"]))
-            curr = sampler("currency")
-            chan = sampler("channel")
-            ctry = sampler("counterparty_country")
-            mcc = sampler("mcc")
-            cp = f"CP{random.randint(100000, 999999)}"
-            desc = "synthetic txn"
-            w.writerow([f"T{i:012d}", cid, aid, ts.isoformat(timespec="seconds"), int(round(amt)), curr, chan, cp, ctry, mcc, desc])
+        return np.random.choice(keys, size=size, p=probs)
+
+    tmin = txn_stats["tmin"]
+    span_s = (txn_stats["tmax"] - tmin).total_seconds()
+
+    # Generate each column as one array per block instead of per-row Python calls
+    first = True
+    for start in range(0, n_txn, block):
+        n = min(block, n_txn - start)
+        ci = np.random.randint(0, len(customers), size=n)
+        cids = pd.Series(customers[ci])
+        aj = (np.random.random(n) * n_accts[ci]).astype(int) + 1
+        aids = "A" + cids.str[1:] + "_" + pd.Series(aj).astype(str)
+        ts = tmin.to_datetime64() + (np.random.random(n) * span_s).astype("timedelta64[s]")
+        amt = np.rint(np.random.choice(txn_stats["amounts"], size=n)).astype(np.int64)
+        cp = "CP" + pd.Series(np.random.randint(100000, 1000000, size=n)).astype(str)
+        ids = "T" + pd.Series(np.arange(start + 1, start + n + 1)).astype(str).str.zfill(12)
+        df = pd.DataFrame({
+            "txn_id": ids,
+            "customer_id": cids,
+            "account_id": aids,
+            "datetime": pd.Series(ts).dt.strftime("%Y-%m-%dT%H:%M:%S"),
+            "amount": amt,
+            "currency": sample_col("currency", n),
+            "channel": sample_col("channel", n),
+            "counterparty_id": cp,
+            "counterparty_country": sample_col("counterparty_country", n),
+            "mcc": sample_col("mcc", n),
+            "description": "synthetic txn",
+        })
+        df.to_csv(out_csv_path, index=False, mode=("w" if first else "a"), header=first)
+        first = False
 
 def main():
     args = parse_args()
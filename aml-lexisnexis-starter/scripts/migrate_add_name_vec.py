@@ -4,25 +4,26 @@ import sqlite3, pathlib
 
 DB = pathlib.Path("data/external/sanctions/kb.sqlite")
 
-SQLS = [
-    "ALTER TABLE entities ADD COLUMN name_vec BLOB;",
-    "ALTER TABLE entities ADD COLUMN name_vec_model TEXT;",
-]
+# Vectors live in a narrow side table instead of widening every entities row:
+# full-row SELECTs on entities stay compact, and vector scans hit a table
+# that is nothing but (id, model, ~1.5KB blob) per row.
+SQL = """
+CREATE TABLE IF NOT EXISTS entity_vectors (
+  entity_id INTEGER PRIMARY KEY,
+  model TEXT,
+  vec BLOB NOT NULL
+) WITHOUT ROWID;
+"""
 
 con = sqlite3.connect(DB)
 try:
-    for stmt in SQLS:
-        try:
-            con.execute(stmt)
-        except sqlite3.OperationalError as e:
-            # Ignore "duplicate column name" and similar
-            msg = str(e).lower()
-            if "duplicate column name" in msg or "already exists" in msg:
-                pass
-            else:
-                raise
+    # 8KB pages fit several 384-dim float32 vectors (1.5KB each) per page;
+    # page_size only applies before first write or after VACUUM
+    con.execute("PRAGMA page_size=8192;")
+    con.execute("PRAGMA journal_mode=WAL;")
+    con.execute(SQL)
     con.commit()
 finally:
     con.close()
 
-print("Ensured columns: name_vec (BLOB), name_vec_model (TEXT)")
+print("Ensured table: entity_vectors (entity_id, model, vec) WITHOUT ROWID")
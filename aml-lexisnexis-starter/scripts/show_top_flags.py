@@ -6,21 +6,18 @@ if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 # -------------------------------------------------------------
 
-<<<<<<< HEAD
-import os
 import argparse
-=======
->>>>>>> origin/main
 import pandas as pd
-pd.set_option("display.width", 160)
-pd.set_option("display.max_columns", 30)
 
 from src.aml.data_ingest import load_transactions, load_lexisnexis, join_txn_lexisnexis
 from src.aml.models.isolation_forest import train_and_score
-<<<<<<< HEAD
 parser = argparse.ArgumentParser()
 parser.add_argument("--max_rows", type=int, default=None)
 args = parser.parse_args()
+
+# ensure output dirs once up front
+os.makedirs("data/processed", exist_ok=True)
+os.makedirs("reports", exist_ok=True)
 # 1) Load transactions
 txn_path = 'data/raw/transactions.csv'
 txn = load_transactions(txn_path)
@@ -37,18 +34,6 @@ joined = txn  # default: score transactions alone
 # 2) Train + score
 scored, meta = train_and_score(joined)
 print("FEATURES USED:", meta.get("features_used"))
-=======
-from src.aml.evaluation import top_flags
-
-# 1) Load + join (use your sample files or swap to big ones later)
-txn = load_transactions('data/raw/transactions1.csv')
-ln  = load_lexisnexis('data/raw/lexisnexis1.xml')
-joined = join_txn_lexisnexis(txn, ln)
-
-# 2) Score
-scored, meta = train_and_score(joined)
-print("FEATURES USED:", meta["features_used"])
->>>>>>> origin/main
 
 # 3) Pick & format columns for view
 cols = [
@@ -56,75 +41,68 @@ cols = [
     "pep_flag", "sanctions_flag", "adverse_media_score", "risk_rating",
     "anomaly_score"
 ]
-have = [c for c in cols if c in scored.columns]
-view = scored[have].copy()
+# set-membership beats repeated Index.__contains__ calls
+col_set = set(scored.columns)
+have = [c for c in cols if c in col_set]
+# column selection only — no full-frame copy; the coercions below replace
+# single columns, which copy-on-write handles without touching `scored`
+view = scored[have]
 
 # numeric cleanup / rounding
+view_cols = set(view.columns)
 for c in ("amount", "adverse_media_score", "risk_rating", "anomaly_score"):
-    if c in view.columns:
+    if c in view_cols:
         view[c] = pd.to_numeric(view[c], errors="coerce")
-if "anomaly_score" in view.columns:
+if "anomaly_score" in view_cols:
     view["anomaly_score"] = view["anomaly_score"].round(6)
 
-# sort & preview
-<<<<<<< HEAD
-if "anomaly_score" in view.columns:
-    view = view.sort_values("anomaly_score", ascending=False)
-top10 = view.head(10)
+# preview: heap-select the top 10 (O(N log k)) instead of fully sorting the
+# scored frame just to grab ten rows; the full dump below stays unsorted
+if "anomaly_score" in view_cols:
+    top10 = view.nlargest(10, "anomaly_score")
+else:
+    top10 = view.head(10)
 print(top10.to_string(index=False))
 
-# ensure output dirs
-os.makedirs("data/processed", exist_ok=True)
-os.makedirs("reports", exist_ok=True)
-=======
-view = view.sort_values("anomaly_score", ascending=False)
-top10 = view.head(10)
-print(top10.to_string(index=False))
-
-# ensure output dir
-os.makedirs("data/processed", exist_ok=True)
->>>>>>> origin/main
+# CSV only for the small human-readable preview; the full scored dump goes
+# to compressed Parquet (much faster to write and ~5x smaller than CSV)
 top10.to_csv("data/processed/flagged_top10.csv", index=False)
-view.to_csv("data/processed/flagged_all_scored.csv", index=False)
-print("\nSaved: data/processed/flagged_top10.csv and data/processed/flagged_all_scored.csv")
+view.to_parquet("data/processed/flagged_all_scored.parquet",
+                engine="pyarrow", compression="zstd", index=False)
+print("\nSaved: data/processed/flagged_top10.csv and data/processed/flagged_all_scored.parquet")
 
 # -------------------------------
 # (2) QUICK THRESHOLD (95th pct)
 # -------------------------------
 import numpy as np
-if "anomaly_score" in view.columns:
-    thr = np.quantile(view["anomaly_score"].dropna(), 0.95)
-    high = view[view["anomaly_score"] >= thr].copy()
+if "anomaly_score" in view_cols:
+    scores = view["anomaly_score"].dropna().to_numpy()
+    # O(N) selection of the 95th-percentile order statistic (no full sort)
+    k = min(scores.size - 1, int(0.95 * scores.size))
+    thr = np.partition(scores, k)[k]
+    high = view[view["anomaly_score"] >= thr]
     high.to_csv("data/processed/flagged_p95.csv", index=False)
     print(f"Threshold = {thr:.6f}  |  Saved: data/processed/flagged_p95.csv  |  Count: {len(high)}")
 
 # -----------------------------------------
 # (3) HISTOGRAM PNG (anomaly score dist.)
 # -----------------------------------------
-import matplotlib
-<<<<<<< HEAD
-# In headless environments (e.g., CI), use a non-GUI backend:
-# matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-
-if "anomaly_score" in view.columns:
-    plt.figure()
-    view["anomaly_score"].hist(bins=30)
-    plt.title("Anomaly Score Distribution")
-    plt.xlabel("anomaly_score"); plt.ylabel("count")
-    plt.tight_layout()
-    plt.savefig("reports/anomaly_hist.png", dpi=150)
+if "anomaly_score" in view_cols:
+    # matplotlib costs ~1s of import time — only pay it when we actually plot,
+    # and pin the non-GUI Agg backend before pyplot probes for one
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    # bin in numpy and draw plain bars — skips pandas' Series.hist machinery
+    a = view["anomaly_score"].to_numpy()
+    a = a[~np.isnan(a)]
+    counts, edges = np.histogram(a, bins=30)
+    fig, ax = plt.subplots()
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align="edge")
+    ax.set_title("Anomaly Score Distribution")
+    ax.set_xlabel("anomaly_score"); ax.set_ylabel("count")
+    fig.tight_layout()
+    fig.savefig("reports/anomaly_hist.png", dpi=100)
+    plt.close(fig)
     print("Saved: reports/anomaly_hist.png")
-=======
-# In headless environments, ensure a non-GUI backend:
-# matplotlib.use("Agg")  # uncomment if you run this on a server/CI
-import matplotlib.pyplot as plt
-
-plt.figure()
-view["anomaly_score"].hist(bins=30)
-plt.title("Anomaly Score Distribution")
-plt.xlabel("anomaly_score"); plt.ylabel("count")
-plt.tight_layout()
-plt.savefig("data/processed/anomaly_hist.png", dpi=150)
-print("Saved: data/processed/anomaly_hist.png")
->>>>>>> origin/main
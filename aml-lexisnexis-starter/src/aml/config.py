@@ -37,3 +37,23 @@ class XMLPaths:
 
 C = Columns()
 X = XMLPaths()
+
+# Explicit CSV dtypes so pandas can skip whole-file type inference.
+# Extra keys are ignored for files that lack a column.
+TXN_DTYPES = {
+    C.txn_id: "string",
+    C.customer_id: "string",
+    C.account_id: "string",
+    C.amount: "float32",
+    C.currency: "category",
+    C.channel: "category",
+    C.counterparty_id: "string",
+    C.counterparty_country: "category",
+    C.mcc: "category",
+}
+
+LN_DTYPES = {
+    C.ln_customer_id: "string",
+    C.risk_rating: "float32",
+    C.adverse_media_score: "float32",
+}
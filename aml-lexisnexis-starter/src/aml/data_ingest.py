@@ -29,6 +29,34 @@ def _existing(*candidates):
 def _ext(path: str) -> str:
     return os.path.splitext(path)[1].lower()
 
+def _read_csv_fast(path: str) -> pd.DataFrame:
+    """
+    Read a whole CSV via PyArrow's multithreaded reader (much faster than the
+    pandas parser on big files); falls back to pandas when pyarrow is absent.
+    """
+    try:
+        from pyarrow import csv as pa_csv
+    except ImportError:
+        return pd.read_csv(path)
+    return pa_csv.read_csv(path).to_pandas()
+
+def _strip_key(s: pd.Series) -> pd.Series:
+    """
+    Normalize a join key to stripped strings in one pass. Arrow's
+    utf8_trim_whitespace trims in C without the astype(str) -> str.strip()
+    double allocation; the pandas fallback at least skips the astype round-trip
+    when the column is already string-typed.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        if pd.api.types.is_string_dtype(s):
+            return s.str.strip()
+        return s.astype(str).str.strip()
+    arr = pc.utf8_trim_whitespace(pa.Array.from_pandas(s).cast(pa.string()))
+    return pd.Series(arr.to_pandas(), index=s.index, name=s.name)
+
 def _map_transactions_schema_if_needed(df: pd.DataFrame) -> pd.DataFrame:
     """Map non-standard transactions headers into the canonical schema if detected.
 
@@ -87,6 +115,48 @@ def _map_transactions_schema_if_needed(df: pd.DataFrame) -> pd.DataFrame:
 
     return mapped
 
+def _iterparse_table(path: str, item_tag: str) -> pd.DataFrame:
+    """
+    Stream row elements with lxml.iterparse into dict-of-lists columns,
+    clearing each element after use so peak memory stays flat.
+    """
+    from lxml import etree
+
+    cols: Dict[str, List] = {}
+
+    def append(key, val, n):
+        col = cols.get(key)
+        if col is None:
+            col = cols[key] = [None] * n
+        if len(col) > n:
+            # duplicate tag within this row — same suffixing as the DOM path
+            i = 2
+            while True:
+                k2 = f"{key}_{i}"
+                c2 = cols.get(k2)
+                if c2 is None:
+                    c2 = cols[k2] = [None] * n
+                if len(c2) <= n:
+                    c2.append(val)
+                    return
+                i += 1
+        col.append(val)
+
+    n = 0
+    for _, elem in etree.iterparse(path, tag=item_tag, recover=True):
+        for k, v in elem.attrib.items():
+            append(k, v, n)
+        for child in elem:
+            append(child.tag, (child.text or '').strip(), n)
+        n += 1
+        for col in cols.values():
+            if len(col) < n:
+                col.append(None)
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+    return pd.DataFrame(cols)
+
 def load_table(path: str, *, xml_xpath: Optional[str] = None) -> pd.DataFrame:
     """
     Load a table from CSV or XML into a DataFrame.
@@ -98,7 +168,7 @@ def load_table(path: str, *, xml_xpath: Optional[str] = None) -> pd.DataFrame:
     ext = _ext(path)
     if ext == ".csv":
         # Normalize columns to handle BOMs/whitespace/case inconsistencies
-        df = pd.read_csv(path)
+        df = _read_csv_fast(path)
         df = _normalize_columns(df)
         df = _map_transactions_schema_if_needed(df)
         return df
@@ -116,13 +186,20 @@ def load_table(path: str, *, xml_xpath: Optional[str] = None) -> pd.DataFrame:
     except Exception:
         pass
 
-    # 2) Fallback: minimal XML parsing (ElementTree)
+    # 2) Fallback: streaming parse via lxml.iterparse (O(1) memory, no DOM),
+    # building dict-of-lists columns directly
+    item_tag = xpath.split('/')[-1] if '/' in xpath else xpath
+    if item_tag not in ('.', '*', './/*'):
+        try:
+            return _iterparse_table(path, item_tag)
+        except ImportError:
+            pass  # lxml not installed; use the ElementTree path below
+
+    # 3) Last resort: minimal XML parsing (ElementTree, full DOM)
     import xml.etree.ElementTree as ET
     tree = ET.parse(path)
     root = tree.getroot()
 
-    # choose last path segment as item tag
-    item_tag = xpath.split('/')[-1] if '/' in xpath else xpath
     if item_tag in ('.', '*', './/*'):
         first = next(iter(root.iter()), None)
         if first is not None:
@@ -165,7 +242,18 @@ def load_lexisnexis(path: Optional[str] = None) -> pd.DataFrame:
     )
     if not p:
         raise FileNotFoundError("lexisnexis.csv or lexisnexis.xml not found in data/raw/")
-    return load_table(p, xml_xpath=X.lexisnexis_xpath)
+    df = load_table(p, xml_xpath=X.lexisnexis_xpath)
+    # XML parsing hands these back as strings; narrow them to small ints here
+    # so downstream feature building skips the to_numeric pass and the feature
+    # matrix stays 4-8x smaller on these columns (NaN-bearing columns are left
+    # alone — int8/int16 can't hold missing values)
+    for col, dtype in (("pep_flag", "int8"), ("sanctions_flag", "int8"),
+                       ("risk_rating", "int8"), ("adverse_media_score", "int16")):
+        if col in df.columns:
+            s = pd.to_numeric(df[col], errors="coerce")
+            if s.notna().all():
+                df[col] = s.astype(dtype)
+    return df
 
 def validate_inputs(txn_path: Optional[str] = None, ln_path: Optional[str] = None):
     try:
@@ -195,14 +283,41 @@ def join_txn_lexisnexis(txn_df: pd.DataFrame, ln_df: pd.DataFrame) -> pd.DataFra
     right_key = _resolve_key(ln_df, C.ln_customer_id)
 
     # Coerce join keys to consistent dtype (strings) to avoid int/object merge errors
-    txn_df[left_key] = txn_df[left_key].astype(str).str.strip()
-    ln_df[right_key] = ln_df[right_key].astype(str).str.strip()
-
-    return txn_df.merge(ln_df, left_on=left_key, right_on=right_key, how="left")
+    txn_df[left_key] = _strip_key(txn_df[left_key])
+    ln_df[right_key] = _strip_key(ln_df[right_key])
+
+    # LN is one-row-per-customer, so a left join is just a hash-indexed gather:
+    # index LN once, reindex by the txn keys, and concat horizontally.
+    # Avoids merge planning and the intermediate merge buffers.
+    ln_indexed = ln_df.drop_duplicates(subset=right_key).set_index(right_key)
+    overlap = [c for c in ln_indexed.columns if c in txn_df.columns]
+    if overlap:
+        ln_indexed = ln_indexed.rename(columns={c: f"{c}_y" for c in overlap})
+    # Dictionary-encode the txn keys against the LN index once, then gather by
+    # integer code — hashes small ints instead of one Python string per row
+    # (code -1, i.e. no LN match, reindexes to an all-NaN row)
+    codes = pd.Categorical(txn_df[left_key].to_numpy(), categories=ln_indexed.index).codes
+    enriched = ln_indexed.reset_index(drop=True).reindex(codes)
+    enriched.index = txn_df.index
+    return pd.concat([txn_df, enriched], axis=1, copy=False)
 
 import pandas as pd
 from .config import C
 
+def _iter_csv_chunks(path: str, chunksize: int):
+    """
+    Yield DataFrame chunks from a CSV. Uses pyarrow's multithreaded streaming
+    reader (64MB blocks) when available, else pandas' chunked reader.
+    """
+    try:
+        from pyarrow import csv as pa_csv
+    except ImportError:
+        yield from pd.read_csv(path, chunksize=chunksize)
+        return
+    reader = pa_csv.open_csv(path, read_options=pa_csv.ReadOptions(block_size=64 << 20))
+    for batch in reader:
+        yield batch.to_pandas()
+
 def stream_left_join_to_csv(
     txn_path: str,
     ln_path: str,
@@ -224,13 +339,35 @@ def stream_left_join_to_csv(
         keep = {ln_key, *ln_keep_cols}
         ln_df = ln_df[[c for c in ln_df.columns if c in keep]]
 
-    # Stream transactions in chunks (CSV only)
+    # Stream transactions in chunks (CSV only); serialize through Arrow's CSV
+    # writer when available (single fd, one writer for all chunks)
+    try:
+        import pyarrow as pa
+        from pyarrow import csv as pa_csv
+    except ImportError:
+        pa = None
+
+    writer = None
+    schema = None
     first = True
-    for chunk in pd.read_csv(txn_path, chunksize=chunksize):
-        chunk = _normalize_columns(chunk)
-        txn_key = _resolve_key(chunk, C.customer_id)
-        merged = chunk.merge(ln_df, left_on=txn_key, right_on=ln_key, how="left")
-        merged.to_csv(out_path, index=False, mode=("w" if first else "a"), header=first)
-        first = False
+    try:
+        for chunk in _iter_csv_chunks(txn_path, chunksize):
+            chunk = _normalize_columns(chunk)
+            txn_key = _resolve_key(chunk, C.customer_id)
+            merged = chunk.merge(ln_df, left_on=txn_key, right_on=ln_key, how="left")
+            if pa is not None:
+                tbl = pa.Table.from_pandas(merged, preserve_index=False)
+                if writer is None:
+                    schema = tbl.schema
+                    writer = pa_csv.CSVWriter(out_path, schema)
+                else:
+                    tbl = tbl.cast(schema)
+                writer.write_table(tbl)
+            else:
+                merged.to_csv(out_path, index=False, mode=("w" if first else "a"), header=first)
+                first = False
+    finally:
+        if writer is not None:
+            writer.close()
 
     return {"out_csv": out_path, "chunksize": chunksize, "ln_cols": ln_df.columns.tolist()}
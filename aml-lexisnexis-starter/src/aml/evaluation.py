@@ -1,10 +1,19 @@
 
+import numpy as np
 import pandas as pd
 
-def top_flags(df_scored: pd.DataFrame, k: int = 100):
-    cols = [c for c in df_scored.columns if c not in {"description"}]
-    if "anomaly_score" in df_scored.columns:
-        # Efficient top-k without full sort to reduce memory
-        topk = df_scored.nlargest(k, columns=["anomaly_score"])  # uses partial sort
-        return topk[cols]
-    return df_scored[cols].head(k)
+def top_flags(df_scored: pd.DataFrame, k: int = 100, score_col: str = "anomaly_score"):
+    if score_col in df_scored.columns:
+        if len(df_scored) <= k:
+            out = df_scored.sort_values(score_col, ascending=False)
+        else:
+            # O(N) partial sort: partition out the top k, then order just those k
+            scores = df_scored[score_col].to_numpy()
+            idx = np.argpartition(scores, -k)[-k:]
+            idx = idx[np.argsort(-scores[idx])]
+            out = df_scored.iloc[idx]
+    else:
+        out = df_scored.head(k)
+    # single vectorized column drop on the k-row result, instead of rebuilding
+    # the column Index from a Python comprehension over the full frame
+    return out.drop(columns=["description"], errors="ignore")
@@ -3,27 +3,83 @@ import pandas as pd
 import numpy as np
 from .config import C
 
+TRUE_TOKENS = frozenset({"1", "y", "yes", "true"})
+
 def add_basic_features(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-    # parse time
-    out["_dt"] = pd.to_datetime(out[C.datetime], errors="coerce")
-    out["hour"] = out["_dt"].dt.hour
-    out["day"] = out["_dt"].dt.day
-    out["month"] = out["_dt"].dt.month
-    out["dow"] = out["_dt"].dt.dayofweek
+    # parse time; ingestion writes ISO8601, so skip pandas' per-string
+    # format inference and let repeated timestamps hit the parse cache
+    dt = pd.to_datetime(df[C.datetime], format="ISO8601", errors="coerce", cache=True)
+    # assign shares the untouched column buffers with df — no full-frame copy
+    out = df.assign(
+        _dt=dt,
+        hour=dt.dt.hour,
+        day=dt.dt.day,
+        month=dt.dt.month,
+        dow=dt.dt.dayofweek,
+    )
 
-    # velocity features by customer
+    # velocity features by customer (sort_values yields a fresh frame, so the
+    # in-place column writes below never touch the caller's df)
     out = out.sort_values([C.customer_id, "_dt"])
-    out["amt_z_by_customer"] = out.groupby(C.customer_id)[C.amount].transform(
-        lambda s: (s - s.mean()) / (s.std(ddof=0) + 1e-6)
-    )
-    out["amt_rolling_mean_7"] = out.groupby(C.customer_id)[C.amount].transform(
-        lambda s: s.rolling(7, min_periods=1).mean()
-    )
+    amts = out[C.amount].to_numpy(dtype=np.float64) if len(out) else np.empty(0)
+    if len(out) and not np.isnan(amts).any():
+        # fused single pass: after the sort each customer is one contiguous run,
+        # so group sums/squares (for the z-score) and a cumsum-based rolling
+        # mean come out of one traversal of the amount column
+        codes = pd.factorize(out[C.customer_id])[0]
+        starts = np.flatnonzero(np.r_[True, np.diff(codes) != 0])
+        counts = np.diff(np.r_[starts, len(codes)])
+        mu_g = np.add.reduceat(amts, starts) / counts
+        var_g = np.add.reduceat(amts * amts, starts) / counts - mu_g * mu_g
+        mu = np.repeat(mu_g, counts)
+        sd = np.repeat(np.sqrt(np.maximum(var_g, 0.0)), counts)
+        out["amt_z_by_customer"] = (amts - mu) / (sd + 1e-6)
+        # rolling(7, min_periods=1).mean() from the cumulative sum, clamping
+        # each window at its customer run start
+        cs = np.cumsum(amts)
+        idx = np.arange(len(amts))
+        lo = np.maximum(idx - 6, np.repeat(starts, counts))
+        prev = np.where(lo > 0, cs[lo - 1], 0.0)
+        out["amt_rolling_mean_7"] = (cs - prev) / (idx - lo + 1)
+    else:
+        # NaN amounts (or empty frame): fall back to pandas' NaN-aware kernels
+        g = out.groupby(C.customer_id, sort=False, observed=True)[C.amount]
+        mu = g.transform("mean").to_numpy()
+        sd = np.sqrt(g.transform("var", ddof=0).to_numpy())
+        out["amt_z_by_customer"] = (out[C.amount].to_numpy() - mu) / (sd + 1e-6)
+        roll = out.groupby(C.customer_id, sort=False)[C.amount].rolling(7, min_periods=1).mean()
+        out["amt_rolling_mean_7"] = roll.reset_index(level=0, drop=True)
 
-    # simple risk flags numeric
+    # simple risk flags numeric (vectorized isin, no per-element dict lookup)
     for flag in ["pep_flag", "sanctions_flag"]:
         if flag in out.columns:
-            out[flag] = out[flag].map({True: 1, "True": 1, 1: 1, "Y": 1, "Yes": 1}).fillna(0).astype(int)
+            s = out[flag]
+            if s.dtype == bool:
+                out[flag] = s.astype(np.int8)
+            elif pd.api.types.is_numeric_dtype(s):
+                out[flag] = s.eq(1).to_numpy().astype(np.int8)
+            else:
+                truthy = s.astype("string").str.lower().isin(TRUE_TOKENS)
+                # object columns can hold numeric 1/1.0 alongside strings
+                truthy |= pd.to_numeric(s, errors="coerce").eq(1)
+                out[flag] = truthy.to_numpy().astype(np.int8)
 
     return out
+
+def add_basic_features_parallel(df: pd.DataFrame, n_shards: int | None = None) -> pd.DataFrame:
+    """
+    Parallel add_basic_features for large frames: every feature is computed
+    per customer, so sharding by customer hash splits the work exactly.
+    Falls back to the sequential path for small inputs or a single shard.
+    """
+    import os
+    n_shards = n_shards or (os.cpu_count() or 1)
+    if n_shards <= 1 or len(df) < 100_000:
+        return add_basic_features(df)
+    from joblib import Parallel, delayed  # shipped with scikit-learn
+    codes = pd.factorize(df[C.customer_id])[0]
+    shards = [df.iloc[np.flatnonzero(codes % n_shards == i)] for i in range(n_shards)]
+    results = Parallel(n_jobs=n_shards)(
+        delayed(add_basic_features)(s) for s in shards if len(s)
+    )
+    return pd.concat(results).sort_index()
@@ -1,5 +1,5 @@
 
-from sklearn.ensemble import IsolationForest
+import numpy as np
 import pandas as pd
 from ..feature_engineering import add_basic_features
 from ..config import C
@@ -10,32 +10,42 @@ FEATURES = [
 ]
 
 def train_and_score(df: pd.DataFrame, random_state: int = 42):
+    # sklearn import is ~1s; defer it so importing the package stays cheap
+    from sklearn.ensemble import IsolationForest
+
     df_fe = add_basic_features(df)
-<<<<<<< HEAD
-    # Select numeric features safely and reduce memory footprint
+    # Select numeric features safely; materialize one C-contiguous float32
+    # array (sklearn walks rows during score_samples) with no intermediate
+    # astype/fillna frame copies
     use_cols = [c for c in FEATURES if c in df_fe.columns]
-    X = (
-        df_fe[use_cols]
-        .select_dtypes(include="number")
-        .astype("float32")
-        .fillna(0.0)
+    num = df_fe[use_cols].select_dtypes(include="number")
+    X = np.ascontiguousarray(num.to_numpy(dtype=np.float32, na_value=0.0))
+    use_cols = list(num.columns)
+    # 100 trees on 256-row subsamples, per the original IF paper — scores
+    # converge well before 200 trees, and small trees score far faster
+    iso = IsolationForest(
+        n_estimators=100,
+        max_samples=min(256, len(X)),
+        contamination="auto",
+        n_jobs=-1,
+        random_state=random_state,
     )
-    iso = IsolationForest(n_estimators=200, contamination="auto", random_state=random_state)
     iso.fit(X)
-    scores = -iso.score_samples(X)  # higher = more anomalous
+    if len(X) >= 200_000:
+        # score row blocks across threads: the fitted trees are read-only and
+        # the traversal loops release the GIL, and X is contiguous so the
+        # block slices are zero-copy views
+        import os
+        from joblib import Parallel, delayed  # shipped with scikit-learn
+        blocks = np.array_split(np.arange(len(X)), max(1, os.cpu_count() or 1))
+        scores = -np.concatenate(
+            Parallel(n_jobs=-1, prefer="threads")(
+                delayed(iso.score_samples)(X[b[0]:b[-1] + 1]) for b in blocks if len(b)
+            )
+        )
+    else:
+        scores = -iso.score_samples(X)  # higher = more anomalous
     # Write scores in-place to avoid copying large DataFrames
-    df_fe.loc[:, "anomaly_score"] = pd.Series(scores, index=df_fe.index, dtype="float32")
+    df_fe["anomaly_score"] = scores.astype(np.float32, copy=False)
     # Return unsorted to avoid expensive global sort on very large datasets; downstream will pick top-k efficiently
     return df_fe, {"features_used": use_cols}
-=======
-    # select numeric features safely
-    use_cols = [c for c in FEATURES if c in df_fe.columns]
-    X = df_fe[use_cols].select_dtypes(include="number").fillna(0.0)
-    iso = IsolationForest(n_estimators=200, contamination="auto", random_state=random_state)
-    iso.fit(X)
-    scores = -iso.score_samples(X)  # higher = more anomalous
-    out = df_fe.copy()
-    out["anomaly_score"] = scores
-    # Return unsorted to avoid expensive global sort on very large datasets; downstream will pick top-k efficiently
-    return out, {"features_used": use_cols}
->>>>>>> origin/main
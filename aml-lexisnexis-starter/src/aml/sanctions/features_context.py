@@ -21,24 +21,51 @@ def _ascii_fold(s: str) -> str:
         s = unidecode(s)
     return s
 
+# hot-path patterns compiled once at import (skips the re-cache hash per call)
+_RE_KEEP = re.compile(r"[^a-z0-9 /&'().-]")
+_RE_WS = re.compile(r"\s+")
+# byte-level delete table: bytes.translate runs in C, ~10x faster than re.sub
+_NON_ALNUM_BYTES = bytes(i for i in range(128) if not chr(i).isalnum())
+
 def _norm_space_lower(s: str) -> str:
     s = _ascii_fold(s).strip().lower()
-    s = re.sub(r"[^a-z0-9 /&'().-]", " ", s)
-    s = re.sub(r"\s+", " ", s)
+    s = _RE_KEEP.sub(" ", s)
+    s = _RE_WS.sub(" ", s)
     return s
 
 def _norm_alnum_upper(s: str) -> str:
-    return re.sub(r"[^A-Za-z0-9]", "", s or "").upper()
+    return (s or "").upper().encode("ascii", "ignore").translate(None, _NON_ALNUM_BYTES).decode()
 
-def _split_pipes(s: Optional[str]) -> list[str]:
+def _split_pipes(s) -> list[str]:
+    """Split a multi-valued field: accepts an already-parsed list, a JSON
+    array (the KB's storage format), or a legacy pipe-joined string."""
     if not s:
         return []
-    return [part.strip() for part in str(s).split("|") if part.strip()]
+    if isinstance(s, (list, tuple)):
+        return [t for t in (str(x).strip() for x in s) if t]
+    s = str(s)
+    if s[0] == "[":
+        try:
+            return [t for t in (str(x).strip() for x in json.loads(s)) if t]
+        except ValueError:
+            pass
+    return [part.strip() for part in s.split("|") if part.strip()]
+
+_DATE_FMTS = ["%Y-%m-%d", "%Y/%m/%d", "%d-%m-%Y", "%d/%m/%Y", "%Y%m%d"]
 
+@lru_cache(maxsize=8192)
 def _try_parse_date(s: str) -> Optional[str]:
-    fmts = ["%Y-%m-%d", "%Y/%m/%d", "%d-%m-%Y", "%d/%m/%Y", "%Y%m%d"]
     s = (s or "").strip()
-    for fmt in fmts:
+    # fast path for the dominant ISO shape — no strptime (locale locks, format
+    # re-parse); datetime() still validates the calendar date
+    if len(s) == 10 and s[4] == "-" and s[7] == "-":
+        try:
+            y, m, d = int(s[:4]), int(s[5:7]), int(s[8:10])
+            datetime(y, m, d)
+            return f"{y:04d}-{m:02d}-{d:02d}"
+        except ValueError:
+            return None
+    for fmt in _DATE_FMTS:
         try:
             return datetime.strptime(s, fmt).strftime("%Y-%m-%d")
         except Exception:
@@ -92,11 +119,18 @@ def _load_country_aliases() -> dict:
 
     return {"canonical_lookup": canonical_lookup, "canonical_meta": base}
 
+# inputs already in this shape skip the full _norm_space_lower regex pass
+_RE_SIMPLE_KEY = re.compile(r"[a-z0-9 ]+")
+
 def _canon_country(s: Optional[str]) -> Optional[str]:
     if not s:
         return None
     lookups = _load_country_aliases()["canonical_lookup"]
-    key = _norm_space_lower(s)
+    key = s.strip().lower()
+    if not _RE_SIMPLE_KEY.fullmatch(key):
+        key = _norm_space_lower(s)
+    elif "  " in key:
+        key = " ".join(key.split())
     return lookups.get(key)
 
 def _field_contains_country(field_text: str, canonical_country: str) -> bool:
@@ -122,13 +156,20 @@ def dob_match(query_dob: Optional[str], entity_dob_field: Optional[str]) -> int:
 
 def country_match(query_country: Optional[str],
                   nationalities_field: Optional[str],
-                  address_field: Optional[str] = None) -> int:
+                  address_field: Optional[str] = None,
+                  nationalities_canon_field: Optional[str] = None) -> int:
     canon = _canon_country(query_country)
     if not canon:
         return 0
-    for nat in _split_pipes(nationalities_field):
-        if _canon_country(nat) == canon:
+    if nationalities_canon_field:
+        # field was canonicalized at KB-load time: plain membership check,
+        # no per-token alias lookup
+        if canon in _split_pipes(nationalities_canon_field):
             return 1
+    else:
+        for nat in _split_pipes(nationalities_field):
+            if _canon_country(nat) == canon:
+                return 1
     if address_field and _field_contains_country(address_field, canon):
         return 1
     return 0
@@ -145,9 +186,10 @@ def id_soft_match(query_id: Optional[str], entity_ids_field: Optional[str]) -> i
             break
     else:
         return 0
+    # length gate first, then str.find (C substring scan, no temp slices)
     for eid in _split_pipes(entity_ids_field):
         ceid = _norm_alnum_upper(eid)
-        if ceid and tail in ceid:
+        if len(ceid) >= L and ceid.find(tail) >= 0:
             return 1
     return 0
 
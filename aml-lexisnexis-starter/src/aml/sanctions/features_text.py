@@ -10,6 +10,65 @@ Exposes:
 from __future__ import annotations
 from typing import Iterable, Tuple
 
+try:
+    # C++ implementations (bit-parallel Myers / SIMD) — ~50-100x faster than
+    # the interpreted DP loops below; those remain as the fallback
+    from rapidfuzz.distance import Levenshtein as _RFLevenshtein
+    from rapidfuzz.distance import JaroWinkler as _RFJaroWinkler
+except ImportError:
+    _RFLevenshtein = None
+    _RFJaroWinkler = None
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(cache=True)
+    def _jaro_nb(a, b):  # uint8 codepoint arrays; same algorithm as _jaro
+        la, lb = a.shape[0], b.shape[0]
+        if la == 0 or lb == 0:
+            return 0.0
+        match_distance = max(la, lb) // 2 - 1
+        if match_distance < 0:
+            match_distance = 0
+        a_matches = np.zeros(la, dtype=np.bool_)
+        b_matches = np.zeros(lb, dtype=np.bool_)
+        matches = 0
+        for i in range(la):
+            start = i - match_distance
+            if start < 0:
+                start = 0
+            end = i + match_distance + 1
+            if end > lb:
+                end = lb
+            for j in range(start, end):
+                if b_matches[j] or a[i] != b[j]:
+                    continue
+                a_matches[i] = True
+                b_matches[j] = True
+                matches += 1
+                break
+        if matches == 0:
+            return 0.0
+        transpositions = 0
+        k = 0
+        for i in range(la):
+            if not a_matches[i]:
+                continue
+            while not b_matches[k]:
+                k += 1
+            if a[i] != b[k]:
+                transpositions += 1
+            k += 1
+        t = transpositions // 2
+        return (matches / la + matches / lb + (matches - t) / matches) / 3.0
+else:
+    _jaro_nb = None
+
 # ----------------------------
 # Utilities
 # ----------------------------
@@ -37,6 +96,9 @@ def levenshtein_norm(a: str | None, b: str | None) -> float:
     if la == 0 or lb == 0:
         return 0.0
 
+    if _RFLevenshtein is not None:
+        return _RFLevenshtein.normalized_similarity(a, b)
+
     # DP with two rows (O(min(la, lb)) memory)
     if la < lb:
         a, b = b, a
@@ -125,7 +187,16 @@ def jaro_winkler(a: str | None, b: str | None, p: float = 0.1, max_prefix: int =
     a, b = _normalize_pair(a, b)
     if not a and not b:
         return 1.0
-    j = _jaro(a, b)
+    if _RFJaroWinkler is not None and max_prefix == 4:
+        # rapidfuzz fixes the prefix cap at 4; honor non-default caps in Python
+        return _RFJaroWinkler.normalized_similarity(a, b, prefix_weight=p)
+    if _jaro_nb is not None and a.isascii() and b.isascii():
+        # compiled kernel over raw bytes (ASCII only — multi-byte encodings
+        # would be compared symbol-by-byte)
+        j = _jaro_nb(np.frombuffer(a.encode("ascii"), dtype=np.uint8),
+                     np.frombuffer(b.encode("ascii"), dtype=np.uint8))
+    else:
+        j = _jaro(a, b)
     # Common prefix length up to max_prefix
     prefix = 0
     for ca, cb in zip(a, b):
@@ -161,6 +232,28 @@ def token_overlap(a: str | None, b: str | None) -> float:
     union = len(ta | tb)
     return inter / union if union else 0.0
 
+def token_hashes(s: str | None) -> np.ndarray:
+    """
+    Sorted-unique int64 token hashes for one name. Precompute these once per
+    unique name when scoring many pairs: Jaccard then runs on numpy arrays
+    instead of building two Python sets per comparison.
+    """
+    s = (s or "").strip().lower()
+    toks = {hash(t) for t in s.split() if t}
+    return np.fromiter(sorted(toks), dtype=np.int64, count=len(toks))
+
+def token_overlap_hashed(a: np.ndarray, b: np.ndarray) -> float:
+    """
+    Jaccard overlap over precomputed token-hash arrays (see token_hashes).
+    Matches token_overlap's conventions for empty inputs.
+    """
+    if a.size == 0 and b.size == 0:
+        return 1.0
+    if a.size == 0 or b.size == 0:
+        return 0.0
+    inter = np.intersect1d(a, b, assume_unique=True).size
+    return inter / (a.size + b.size - inter)
+
 
 # ----------------------------
 # Quick self-test (optional)
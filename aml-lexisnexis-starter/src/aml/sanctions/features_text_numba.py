@@ -0,0 +1,151 @@
+"""
+Numba-compiled similarity kernels for the no-rapidfuzz fallback path.
+
+The kernels operate on UTF-32 codepoint arrays (int32), so they handle any
+script — unlike the ASCII-only byte kernel in features_text. When numba is
+not installed HAVE_NUMBA is False and callers stay on the pure-Python
+implementations.
+
+Semantics match features_text: both-empty pairs score 1.0, one-empty 0.0.
+"""
+from __future__ import annotations
+from typing import List, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+HAVE_NUMBA = njit is not None
+
+
+def to_codepoints(s: str) -> np.ndarray:
+    """One string as an int32 codepoint array."""
+    return np.frombuffer(s.encode("utf-32-le"), dtype=np.int32)
+
+
+def codepoint_matrix(strings: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pad strings into one (N, maxlen) int32 matrix plus a length vector, the
+    layout the *_many kernels iterate over in parallel.
+    """
+    lens = np.fromiter((len(s) for s in strings), dtype=np.int64, count=len(strings))
+    width = max(int(lens.max()), 1) if len(strings) else 1
+    mat = np.zeros((len(strings), width), dtype=np.int32)
+    for i, s in enumerate(strings):
+        if s:
+            mat[i, : len(s)] = to_codepoints(s)
+    return mat, lens
+
+
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def lev_norm(a, b):  # int32 codepoint arrays
+        la, lb = a.shape[0], b.shape[0]
+        if la == 0 and lb == 0:
+            return 1.0
+        if la == 0 or lb == 0:
+            return 0.0
+        if la == lb:
+            equal = True
+            for i in range(la):
+                if a[i] != b[i]:
+                    equal = False
+                    break
+            if equal:
+                return 1.0
+        if la < lb:
+            a, b = b, a
+            la, lb = lb, la
+        prev = np.empty(lb + 1, dtype=np.int64)
+        curr = np.empty(lb + 1, dtype=np.int64)
+        for j in range(lb + 1):
+            prev[j] = j
+        for i in range(1, la + 1):
+            curr[0] = i
+            ca = a[i - 1]
+            for j in range(1, lb + 1):
+                cost = 0 if ca == b[j - 1] else 1
+                d = prev[j] + 1
+                if curr[j - 1] + 1 < d:
+                    d = curr[j - 1] + 1
+                if prev[j - 1] + cost < d:
+                    d = prev[j - 1] + cost
+                curr[j] = d
+            prev, curr = curr, prev
+        dist = prev[lb]
+        denom = la if la > lb else lb
+        sim = 1.0 - dist / denom
+        return sim if sim > 0.0 else 0.0
+
+    @njit(cache=True)
+    def jaro(a, b):  # int32 codepoint arrays; same algorithm as features_text._jaro
+        la, lb = a.shape[0], b.shape[0]
+        if la == 0 and lb == 0:
+            return 1.0
+        if la == 0 or lb == 0:
+            return 0.0
+        match_distance = max(la, lb) // 2 - 1
+        if match_distance < 0:
+            match_distance = 0
+        a_matches = np.zeros(la, dtype=np.bool_)
+        b_matches = np.zeros(lb, dtype=np.bool_)
+        matches = 0
+        for i in range(la):
+            start = i - match_distance
+            if start < 0:
+                start = 0
+            end = i + match_distance + 1
+            if end > lb:
+                end = lb
+            for j in range(start, end):
+                if b_matches[j] or a[i] != b[j]:
+                    continue
+                a_matches[i] = True
+                b_matches[j] = True
+                matches += 1
+                break
+        if matches == 0:
+            return 0.0
+        transpositions = 0
+        k = 0
+        for i in range(la):
+            if not a_matches[i]:
+                continue
+            while not b_matches[k]:
+                k += 1
+            if a[i] != b[k]:
+                transpositions += 1
+            k += 1
+        t = transpositions // 2
+        return (matches / la + matches / lb + (matches - t) / matches) / 3.0
+
+    @njit(cache=True)
+    def jaro_winkler(a, b, p=0.1, max_prefix=4):
+        j = jaro(a, b)
+        prefix = 0
+        n = min(a.shape[0], b.shape[0], max_prefix)
+        for i in range(n):
+            if a[i] != b[i]:
+                break
+            prefix += 1
+        return j + prefix * p * (1.0 - j)
+
+    @njit(cache=True, parallel=True)
+    def lev_norm_many(q, mat, lens):
+        out = np.empty(lens.shape[0], dtype=np.float64)
+        for i in prange(lens.shape[0]):
+            out[i] = lev_norm(q, mat[i, : lens[i]])
+        return out
+
+    @njit(cache=True, parallel=True)
+    def jaro_winkler_many(q, mat, lens, p=0.1, max_prefix=4):
+        out = np.empty(lens.shape[0], dtype=np.float64)
+        for i in prange(lens.shape[0]):
+            out[i] = jaro_winkler(q, mat[i, : lens[i]], p, max_prefix)
+        return out
+else:
+    lev_norm = jaro = jaro_winkler = None
+    lev_norm_many = jaro_winkler_many = None
@@ -1,6 +1,7 @@
 # iso20022_preprocess_audit.py — read ISO20022 XML from inbox, audit preprocessing, and screen()
 from __future__ import annotations
 import csv
+import functools
 from pathlib import Path
 import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
@@ -14,6 +15,10 @@ from aml.sanctions.preprocess import (
     norm_for_matching,
 )
 
+# names repeat heavily across ISO20022 messages; each cache hit skips the
+# five-pass unicode normalization pipeline
+_norm_cached = functools.lru_cache(maxsize=32768)(norm_for_matching)
+
 # Screener (uses your SQLite KB built by load_kb.py)
 from aml.sanctions.screen import screen
 
@@ -22,6 +27,8 @@ from aml.sanctions.features_text import (
     levenshtein_norm,
     jaro_winkler,
     token_overlap,
+    token_hashes,
+    token_overlap_hashed,
 )
 
 INBOX = Path(r".\data\external\iso20022\inbox").resolve()
@@ -56,6 +63,17 @@ ROLE_FULL = {
 }
 
 # --- helpers -----------------------------------------------------------------
+try:
+    import xxhash
+
+    def _cache_key(s: str) -> int:
+        # 8-byte int keys: hashed in one cycle, vs string hashing that walks
+        # every byte on each dict probe of a long normalized name
+        return xxhash.xxh3_64_intdigest(s.encode("utf-8"))
+except ImportError:
+    def _cache_key(s: str) -> str:
+        return s
+
 def localname(tag: str) -> str:
     return tag.rsplit("}", 1)[-1] if "}" in tag else tag
 
@@ -135,6 +153,97 @@ def extract_pairs(root: ET.Element, mtype: str) -> list[tuple[str, str]]:
             out.append(key)
     return out
 
+def _classify_roles(elem, mtype: str) -> list[str]:
+    """Map an <Nm> element to role codes from its ancestor chain (mirrors the
+    findall paths in extract_pairs, resolved locally instead of by tree walk)."""
+    parent = elem.getparent()
+    if parent is None:
+        return []
+    p1 = localname(parent.tag)
+    if p1 == "FinInstnId":
+        gp = parent.getparent()
+        p2 = localname(gp.tag) if gp is not None else ""
+        if p2 in ("DbtrAgt", "CdtrAgt"):
+            return [p2]
+        if p2 in ("InstgAgt", "InstdAgt") and mtype.startswith("pacs.009"):
+            return [p2]
+        return []
+    if p1 in ("InitgPty", "UltmtDbtr", "UltmtCdtr"):
+        return [p1]
+    if p1 in ("Dbtr", "Cdtr"):
+        roles = [p1]
+        gp = parent.getparent()
+        if (gp is not None and localname(gp.tag) == "RltdPties"
+                and mtype.startswith(("camt.053", "camt.054"))):
+            roles.append("NtryDbtr" if p1 == "Dbtr" else "NtryCdtr")
+        return roles
+    if p1 == "Ownr":
+        gp = parent.getparent()
+        if gp is not None and localname(gp.tag) == "Acct":
+            anc = gp.getparent()
+            a = localname(anc.tag) if anc is not None else ""
+            if a == "Stmt" and mtype.startswith("camt.053"):
+                return ["StmtAcctOwnr"]
+            if a == "Ntfctn" and mtype.startswith("camt.054"):
+                return ["NtfctnAcctOwnr"]
+    return []
+
+def _stream_pairs(xml_path: Path) -> tuple[str, list[tuple[str, str]]]:
+    """
+    One lxml streaming pass over the document: every <Nm> is classified from
+    its ancestors as it ends, instead of ~10 full-tree findall walks. Ended
+    entries are cleared so multi-GB inboxes stay within bounded memory.
+    """
+    from lxml import etree
+
+    root = None
+    mtype: str | None = None
+    seen: set[tuple[str, str]] = set()
+    pairs: list[tuple[str, str]] = []
+    for event, elem in etree.iterparse(str(xml_path), events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            continue
+        ln = localname(elem.tag)
+        if ln == "Nm":
+            val = (elem.text or "").strip()
+            if val:
+                if mtype is None:
+                    mtype = msg_type(root)
+                for role in _classify_roles(elem, mtype):
+                    key = (role, val)
+                    if key not in seen:
+                        seen.add(key)
+                        pairs.append(key)
+            elem.clear(keep_tail=True)
+        elif ln == "Ntry":
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    if mtype is None:
+        mtype = msg_type(root) if root is not None else ""
+    return mtype, pairs
+
+def _extract_file(xml_path: Path) -> tuple[str, list[tuple[str, str]]]:
+    try:
+        return _stream_pairs(xml_path)
+    except ImportError:
+        # lxml not installed: fall back to the DOM walk
+        root = ET.parse(xml_path).getroot()
+        mtype = msg_type(root)
+        return mtype, extract_pairs(root, mtype)
+
+def _extract_file_safe(xml_path_str: str) -> tuple[str, str | None, list[tuple[str, str]], str | None]:
+    """Worker entry for the process pool: never raises, returns
+    (file_name, mtype, pairs, error)."""
+    p = Path(xml_path_str)
+    try:
+        mtype, pairs = _extract_file(p)
+        return (p.name, mtype, pairs, None)
+    except Exception as e:
+        return (p.name, None, [], str(e))
+
 def audit_row(
     file_name: str,
     mtype: str,
@@ -151,7 +260,7 @@ def audit_row(
     s2 = strip_diacritics(s1)
     s3 = casefold_text(s2)
     s4 = collapse_punct_ws(s3)
-    s5 = norm_for_matching(s0)  # final pipeline output used by screener
+    s5 = _norm_cached(s0)  # final pipeline output used by screener
 
     # ---- expand to full names
     msg_type_full = MSG_TYPE_FULL.get(mtype, mtype)
@@ -183,6 +292,43 @@ def audit_row(
         "top_hit_levenshtein_norm": lev,        # Levenshtein similarity (normalized)
     }
 
+def _batch_sim_feats(pairs: list[tuple[str, str]]) -> list[dict[str, float]]:
+    """
+    Score (query, top-hit) normalized name pairs in one batched call.
+    rapidfuzz's process module runs the whole batch in C++ across threads;
+    without it, fall back to the per-pair scorers from features_text.
+    """
+    if not pairs:
+        return []
+    # hash each unique name's tokens once; Jaccard runs on the int64 arrays
+    hcache: dict[str, object] = {}
+    def _th(s: str):
+        h = hcache.get(s)
+        if h is None:
+            h = hcache[s] = token_hashes(s)
+        return h
+    toks = [token_overlap_hashed(_th(q), _th(p)) for q, p in pairs]
+    try:
+        from rapidfuzz import process
+        from rapidfuzz.distance import JaroWinkler, Levenshtein
+    except ImportError:
+        return [
+            {"tok": t, "jw": jaro_winkler(q, p), "lev": levenshtein_norm(q, p)}
+            for t, (q, p) in zip(toks, pairs)
+        ]
+    qs = [q for q, _ in pairs]
+    ps = [p for _, p in pairs]
+    if hasattr(process, "cpdist"):  # pairwise API (rapidfuzz >= 3.9)
+        jw = process.cpdist(qs, ps, scorer=JaroWinkler.normalized_similarity, workers=-1)
+        lev = process.cpdist(qs, ps, scorer=Levenshtein.normalized_similarity, workers=-1)
+    else:
+        jw = process.cdist(qs, ps, scorer=JaroWinkler.normalized_similarity, workers=-1).diagonal()
+        lev = process.cdist(qs, ps, scorer=Levenshtein.normalized_similarity, workers=-1).diagonal()
+    return [
+        {"tok": t, "jw": float(j), "lev": float(l)}
+        for t, j, l in zip(toks, jw, lev)
+    ]
+
 # --- main --------------------------------------------------------------------
 def main() -> int:
     rows: list[dict[str, str]] = []
@@ -192,25 +338,38 @@ def main() -> int:
 
     # Cache screening results per final_match string to avoid repeated calls
     # value: (decision, top_score, top_name, top_source, sim_feats)
-    screen_cache: dict[str, tuple[str, float | None, str | None, str | None, dict[str, float] | None]] = {}
-
-    for xml_path in INBOX.glob("*.xml"):
-        try:
-            root = ET.parse(xml_path).getroot()
-        except Exception as e:
-            print(f"[WARN] Failed to parse {xml_path.name}: {e}")
+    # keyed by _cache_key(final_match) — int when xxhash is installed
+    screen_cache: dict[int | str, tuple[str, float | None, str | None, str | None, dict[str, float] | None]] = {}
+    # (query, top-hit) pairs whose similarity trio is computed in one batch
+    # after the walk, instead of three scorer calls inline per name
+    pending_sims: dict[int | str, tuple[str, str]] = {}
+    raw_rows: list[tuple[str, str, str, str, int | str]] = []
+
+    # Files are independent: parse + extract in worker processes, then screen
+    # each unique name exactly once in this process (screen_cache dedup)
+    xml_paths = sorted(str(p) for p in INBOX.glob("*.xml"))
+    if len(xml_paths) > 1:
+        import os
+        from concurrent.futures import ProcessPoolExecutor
+        workers = min(os.cpu_count() or 1, len(xml_paths))
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            extracted = list(ex.map(_extract_file_safe, xml_paths, chunksize=4))
+    else:
+        extracted = [_extract_file_safe(p) for p in xml_paths]
+
+    for file_name, mtype, pairs, err in extracted:
+        if err is not None:
+            print(f"[WARN] Failed to parse {file_name}: {err}")
             continue
-
-        mtype = msg_type(root)
-        pairs = extract_pairs(root, mtype)
         if not pairs:
             continue
 
         for role_code, name in pairs:
-            final_key = norm_for_matching(name)
+            final_key = _norm_cached(name)
+            ck = _cache_key(final_key)
 
             # Lookup or call screen()
-            if final_key not in screen_cache:
+            if ck not in screen_cache:
                 try:
                     res = screen(name)  # uses your KB at data/external/sanctions/kb.sqlite
                     decision = res.get("decision")
@@ -220,38 +379,44 @@ def main() -> int:
                         top_score = top[0].get("score")
                         top_name = top[0].get("primary_name")
                         top_source = top[0].get("source")
-                        # Prefer features returned by screen(); else compute
+                        # Prefer features returned by screen(); else defer to
+                        # the post-walk batch
                         sim_feats = top[0].get("features")
                         if not sim_feats and top_name:
-                            qn = norm_for_matching(name)
-                            pn = norm_for_matching(top_name)
-                            sim_feats = {
-                                "tok": token_overlap(qn, pn),
-                                "jw": jaro_winkler(qn, pn),
-                                "lev": levenshtein_norm(qn, pn),
-                            }
+                            pending_sims[ck] = (final_key, _norm_cached(top_name))
+                            sim_feats = None
                     else:
                         top_score = None
                         top_name = None
                         top_source = None
                         sim_feats = None
 
-                    screen_cache[final_key] = (decision, top_score, top_name, top_source, sim_feats)
+                    screen_cache[ck] = (decision, top_score, top_name, top_source, sim_feats)
                 except Exception as e:
                     # On any error, record as review with no hit
-                    screen_cache[final_key] = ("review", None, None, None, None)
+                    screen_cache[ck] = ("review", None, None, None, None)
                     print(f"[WARN] screen() failed for '{name}': {e}")
 
-            decision, top_score, top_name, top_source, sim_feats = screen_cache[final_key]
-            rows.append(
-                audit_row(xml_path.name, mtype, role_code, name,
-                          decision, top_score, top_name, top_source, sim_feats)
-            )
+            raw_rows.append((file_name, mtype, role_code, name, ck))
 
-    if not rows:
+    if not raw_rows:
         print(f"No XML files or no names found under: {INBOX}")
         return 0
 
+    # Batch the deferred similarity trio and patch the cache
+    if pending_sims:
+        keys = list(pending_sims)
+        for key, feats in zip(keys, _batch_sim_feats([pending_sims[k] for k in keys])):
+            decision, top_score, top_name, top_source, _ = screen_cache[key]
+            screen_cache[key] = (decision, top_score, top_name, top_source, feats)
+
+    for file_name, mtype, role_code, name, ck in raw_rows:
+        decision, top_score, top_name, top_source, sim_feats = screen_cache[ck]
+        rows.append(
+            audit_row(file_name, mtype, role_code, name,
+                      decision, top_score, top_name, top_source, sim_feats)
+        )
+
     # ---- header with new similarity fields
     fields = [
         "run_ts",                    # NEW: add run timestamp as the first column
@@ -273,13 +438,13 @@ def main() -> int:
         "top_hit_jaro_winkler",      # NEW
         "top_hit_levenshtein_norm",  # NEW
     ]
-    with OUTCSV.open("w", encoding="utf-8", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=fields)
-        w.writeheader()
-        for r in rows:
-            # Inject the run timestamp per row
-            r = {"run_ts": RUN_TS, **r}
-            w.writerow(r)
+    # plain csv.writer over pre-ordered lists: no per-row fieldname lookups,
+    # and writerows pushes everything through one buffered stream
+    data_fields = fields[1:]  # run_ts is injected as the first cell per row
+    with OUTCSV.open("w", encoding="utf-8", newline="", buffering=1 << 20) as f:
+        w = csv.writer(f)
+        w.writerow(fields)
+        w.writerows([RUN_TS, *(r[k] for k in data_fields)] for r in rows)
 
     print(f"Wrote audit → {OUTCSV}")
     return 0
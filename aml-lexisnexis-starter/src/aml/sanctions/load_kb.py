@@ -1,6 +1,16 @@
 
 import json, sqlite3, pathlib
 
+from aml.sanctions.features_context import _canon_country
+from aml.sanctions.preprocess import norm_for_matching
+
+try:
+  import orjson  # C parser; stdlib json stays as the fallback
+except ImportError:
+  orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
 BASE = pathlib.Path(r".\data\external\sanctions").resolve()
 NORM = BASE / "normalized"
 DB   = BASE / "kb.sqlite"
@@ -8,6 +18,11 @@ DB.parent.mkdir(parents=True, exist_ok=True)
 
 con = sqlite3.connect(DB)
 con.execute("PRAGMA journal_mode=WAL;")
+# bulk-load settings: this script rebuilds the KB from source files, so a
+# crash mid-load just means re-running it — no need to fsync per transaction
+con.execute("PRAGMA synchronous=OFF;")
+con.execute("PRAGMA cache_size=-262144;")
+con.execute("PRAGMA temp_store=MEMORY;")
 
 con.execute("""
 CREATE TABLE IF NOT EXISTS entities (
@@ -16,9 +31,15 @@ CREATE TABLE IF NOT EXISTS entities (
   primary_name TEXT, aliases TEXT, programs TEXT,
   list_date TEXT, last_updated TEXT,
   dob TEXT, nationalities TEXT, addresses TEXT, ids TEXT, remarks TEXT,
-  source_uri TEXT, normalized_name TEXT
+  source_uri TEXT, normalized_name TEXT, nationalities_canon TEXT,
+  name_tokens TEXT
 );
 """)
+for _col in ("nationalities_canon TEXT", "name_tokens TEXT"):
+  try:
+    con.execute(f"ALTER TABLE entities ADD COLUMN {_col}")
+  except sqlite3.OperationalError:
+    pass  # column already present (pre-existing DB)
 
 # Full-text index over names (primary + aliases + normalized_name)
 con.execute("""
@@ -26,43 +47,101 @@ CREATE VIRTUAL TABLE IF NOT EXISTS entity_fts
 USING fts5(primary_name, aliases, normalized_name, content='entities', content_rowid='entity_id');
 """)
 
-def as_pipe(v):
-  if isinstance(v, list): return "|".join([str(x) for x in v])
-  return v or ""
+# sanity check: JSON1 must be available (built in since sqlite 3.38)
+con.execute("SELECT json('[]')")
+
+def as_json(v):
+  # native JSON arrays: consumers json-parse once instead of re-splitting
+  # pipe strings per match, and json_each() makes the fields queryable
+  if isinstance(v, list): return json.dumps([str(x) for x in v], ensure_ascii=False)
+  return json.dumps([str(v)] if v else [], ensure_ascii=False)
+
+def canon_countries_json(v):
+  # canonicalize nationalities once at load time so screening does a plain
+  # set-membership check instead of re-running the alias regexes per query
+  vals = v if isinstance(v, list) else [x for x in str(v or "").split("|")]
+  out = []
+  for x in vals:
+    c = _canon_country(str(x).strip())
+    if c and c not in out:
+      out.append(c)
+  return json.dumps(out, ensure_ascii=False)
 
 # Load the newest UK + UN jsonl (if present), otherwise load all
 files = sorted(NORM.glob("*.jsonl"), key=lambda p: p.stat().st_mtime, reverse=True)
 
-rowids = []
+def row_from(r):
+  return (
+    r.get("source"), r.get("source_id"), r.get("entity_type"),
+    r.get("primary_name"), as_json(r.get("aliases", [])), as_json(r.get("programs", [])),
+    r.get("list_date"), r.get("last_updated"),
+    as_json(r.get("dob", [])), as_json(r.get("nationalities", [])), as_json(r.get("addresses", [])),
+    as_json(r.get("ids", [])), r.get("remarks"), r.get("source_uri"),
+    r.get("normalized_name"), canon_countries_json(r.get("nationalities", [])),
+    as_json(r.get("name_tokens", [])),
+  )
+
+def load_jsonl_into_kb(jsonl_path, con):
+  # Bulk path for one normalized JSONL file: orjson (when present) parses
+  # each line, and executemany prepares the statement once and streams
+  # tuples from the generator — one SQLite crossing per file instead of one
+  # per line. Returns the number of rows inserted.
+  with pathlib.Path(jsonl_path).open("rb") as f:
+    cur = con.executemany("""
+      INSERT INTO entities
+      (source, source_id, entity_type, primary_name, aliases, programs,
+       list_date, last_updated, dob, nationalities, addresses, ids, remarks,
+       source_uri, normalized_name, nationalities_canon, name_tokens)
+      VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+    """, (row_from(_loads(line)) for line in f if line.strip()))
+    return cur.rowcount
+
+con.execute("BEGIN")
+n_loaded = 0
 for jf in files:
-  with jf.open(encoding="utf-8") as f:
-    for line in f:
-      r = json.loads(line)
-      cur = con.execute("""
-        INSERT INTO entities
-        (source, source_id, entity_type, primary_name, aliases, programs,
-         list_date, last_updated, dob, nationalities, addresses, ids, remarks,
-         source_uri, normalized_name)
-        VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-      """, (
-        r.get("source"), r.get("source_id"), r.get("entity_type"),
-        r.get("primary_name"), as_pipe(r.get("aliases", [])), as_pipe(r.get("programs", [])),
-        r.get("list_date"), r.get("last_updated"),
-        as_pipe(r.get("dob", [])), as_pipe(r.get("nationalities", [])), as_pipe(r.get("addresses", [])),
-        as_pipe(r.get("ids", [])), r.get("remarks"), r.get("source_uri"),
-        r.get("normalized_name"),
-      ))
-      rowids.append(cur.lastrowid)
-
-# Populate FTS rows
-con.executemany(
-  "INSERT INTO entity_fts(rowid, primary_name, aliases, normalized_name) VALUES (?,?,?,?)",
-  [(rid,
-    con.execute("SELECT primary_name FROM entities WHERE entity_id=?", (rid,)).fetchone()[0],
-    con.execute("SELECT aliases FROM entities WHERE entity_id=?", (rid,)).fetchone()[0],
-    con.execute("SELECT normalized_name FROM entities WHERE entity_id=?", (rid,)).fetchone()[0],
-  ) for rid in rowids]
-)
+  n_loaded += load_jsonl_into_kb(jf, con)
+
+# backfill normalized_name for rows that arrived without one (older
+# normalizer output) so screening can rely on the column unconditionally
+missing = con.execute(
+  "SELECT entity_id, primary_name FROM entities"
+  " WHERE normalized_name IS NULL OR normalized_name = ''").fetchall()
+if missing:
+  con.executemany("UPDATE entities SET normalized_name = ? WHERE entity_id = ?",
+                  ((norm_for_matching(p or ""), eid) for eid, p in missing))
+
+# same for name_tokens: derive the materialized token set from
+# normalized_name wherever older normalizer output left it empty
+missing = con.execute(
+  "SELECT entity_id, normalized_name FROM entities"
+  " WHERE name_tokens IS NULL OR name_tokens = '' OR name_tokens = '[]'").fetchall()
+if missing:
+  con.executemany("UPDATE entities SET name_tokens = ? WHERE entity_id = ?",
+                  ((as_json(sorted(set((n or "").split()))), eid) for eid, n in missing))
+
+# entity_fts is external-content (content='entities'), so FTS5 can re-derive
+# the whole index from the content table in one C-level pass — no duplicate
+# text rows pushed through Python
+con.execute("INSERT INTO entity_fts(entity_fts) VALUES('rebuild')")
+
+# keep the index consistent under later incremental edits (FTS5 external-
+# content pattern from the SQLite docs)
+con.executescript("""
+CREATE TRIGGER IF NOT EXISTS entities_ai AFTER INSERT ON entities BEGIN
+  INSERT INTO entity_fts(rowid, primary_name, aliases, normalized_name)
+  VALUES (new.entity_id, new.primary_name, new.aliases, new.normalized_name);
+END;
+CREATE TRIGGER IF NOT EXISTS entities_ad AFTER DELETE ON entities BEGIN
+  INSERT INTO entity_fts(entity_fts, rowid, primary_name, aliases, normalized_name)
+  VALUES ('delete', old.entity_id, old.primary_name, old.aliases, old.normalized_name);
+END;
+CREATE TRIGGER IF NOT EXISTS entities_au AFTER UPDATE ON entities BEGIN
+  INSERT INTO entity_fts(entity_fts, rowid, primary_name, aliases, normalized_name)
+  VALUES ('delete', old.entity_id, old.primary_name, old.aliases, old.normalized_name);
+  INSERT INTO entity_fts(rowid, primary_name, aliases, normalized_name)
+  VALUES (new.entity_id, new.primary_name, new.aliases, new.normalized_name);
+END;
+""")
 
 con.commit()
-print(f"Loaded {len(rowids)} records into {DB}")
+print(f"Loaded {n_loaded} records into {DB}")
@@ -11,12 +11,27 @@ import json
 import os
 import re
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from operator import itemgetter
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional
 
+try:
+    import orjson  # C serializer; stdlib json stays as the fallback
+except ImportError:
+    orjson = None
+
+def dumps_line(d: Dict[str, Any]) -> bytes:
+    """One JSONL line as bytes, newline included, for a binary-mode writer."""
+    if orjson is not None:
+        return orjson.dumps(d, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(d, ensure_ascii=False) + "\n").encode("utf-8")
+
 # ------------------------------- paths & base ------------------------------- #
 BASE_DATA = Path(os.getenv("SANCTIONS_DATA_DIR", "./local-data")).resolve()
 RAW_UK = BASE_DATA / "raw" / "uk"
@@ -35,7 +50,7 @@ def join_nonempty(parts: Iterable[str], sep: str = " ") -> str:
 
 # ------------------------------- schema record ----------------------------- #
 
-@dataclass
+@dataclass(slots=True)
 class Record:
     source: str
     source_id: Optional[str] = None
@@ -52,6 +67,7 @@ class Record:
     remarks: Optional[str] = None
     source_uri: Optional[str] = None
     normalized_name: Optional[str] = None  # ← FIXED (removed stray invalid line)
+    name_tokens: List[str] = field(default_factory=list)  # materialized for screening
 
     def finalize(self) -> None:
         self.primary_name = norm(self.primary_name)
@@ -68,6 +84,32 @@ class Record:
         self.list_date = norm(self.list_date) or None
         self.last_updated = norm(self.last_updated) or None
         self.normalized_name = norm_for_matching(self.primary_name or "")  # ← REPLACED
+        # token set materialized once at ingest; screening reads it back
+        # instead of re-splitting normalized_name per candidate per query
+        self.name_tokens = sorted(set(self.normalized_name.split()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Flat dict straight off the slots — asdict() would deep-copy every
+        # list field per record, pure overhead when the dict is serialized
+        # immediately
+        return {
+            "source": self.source,
+            "source_id": self.source_id,
+            "entity_type": self.entity_type,
+            "primary_name": self.primary_name,
+            "aliases": self.aliases,
+            "programs": self.programs,
+            "list_date": self.list_date,
+            "last_updated": self.last_updated,
+            "dob": self.dob,
+            "nationalities": self.nationalities,
+            "addresses": self.addresses,
+            "ids": self.ids,
+            "remarks": self.remarks,
+            "source_uri": self.source_uri,
+            "normalized_name": self.normalized_name,
+            "name_tokens": self.name_tokens,
+        }
 
 # ------------------------------ UK CSV parser ------------------------------- #
 
@@ -82,67 +124,166 @@ def find_header_row(rows: List[List[str]]) -> Optional[int]:
             return i
     return None
 
+_CHUNK_ROWS = 10_000  # records per worker task for the parallel paths
+
+def _write_chunked(chunks: Iterable[list], worker, out) -> int:
+    """
+    Run `worker` (chunk -> (bytes, count)) over a stream of chunks and write
+    the results to `out` in input order.
+
+    The first chunk is held back so a small file runs inline without
+    spawning a pool. Larger files keep a bounded window of in-flight
+    futures — roughly n_workers + 1 chunks alive at once, the deque drained
+    oldest-first before each submit — so peak memory stays bounded
+    regardless of file size while the workers stay busy.
+    """
+    count = 0
+    it = iter(chunks)
+    first = next(it, None)
+    if first is None:
+        return 0
+    second = next(it, None)
+    if second is None:
+        data, n = worker(first)
+        out.write(data)
+        return n
+
+    workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        pending: deque = deque((ex.submit(worker, first), ex.submit(worker, second)))
+        while True:
+            # drain oldest-first down to the worker count before pulling the
+            # next chunk off the generator
+            while len(pending) > workers:
+                data, n = pending.popleft().result()
+                out.write(data)
+                count += n
+            chunk = next(it, None)
+            if chunk is None:
+                break
+            pending.append(ex.submit(worker, chunk))
+        while pending:
+            data, n = pending.popleft().result()
+            out.write(data)
+            count += n
+    return count
+
+def _uk_rows_to_lines(headers: List[str], rows: List[List[str]]) -> tuple[bytes, int]:
+    """
+    Build JSONL bytes for one chunk of UK data rows. Module-level and fed
+    only picklable arguments so ProcessPoolExecutor can run chunks in
+    parallel; the column spec is rebuilt from headers once per chunk.
+    """
+    idx = {h: i for i, h in enumerate(headers)}
+    ncols = len(headers)
+
+    # Column positions resolved once; missing columns point at a padded ""
+    # sentinel slot (index ncols), so the hot loop is C-level itemgetter
+    # fetches instead of a dict lookup + bounds check per field
+    def col(key: str) -> int:
+        i = idx.get(key)
+        return i if i is not None else ncols
+
+    get_names = itemgetter(*(col(f"Name {k}") for k in ("1", "2", "3", "4", "5", "6")))
+    get_aliases = itemgetter(*(col(k) for k in (
+        "Name 2", "Name 3", "Name 4", "Name 5", "Name 6", "Name Non-Latin Script")))
+    get_addr = itemgetter(*(col(k) for k in (
+        "Address 1", "Address 2", "Address 3", "Address 4", "Address 5", "Address 6",
+        "Post/Zip Code", "Country")))
+    i_gid, i_gtype, i_type = col("Group ID"), col("Group Type"), col("Type")
+    i_regime, i_listed, i_upd = col("Regime"), col("Listed On"), col("Last Updated")
+    i_dob, i_nat = col("DOB"), col("Nationality")
+    i_pass, i_nid = col("Passport Number"), col("National Identification Number")
+    i_other = col("Other Information")
+
+    lines: List[bytes] = []
+    count = 0
+    for row in rows:
+        # truncate/pad to header width and append the "" sentinel slot
+        row = row[:ncols]
+        if len(row) < ncols:
+            row += [""] * (ncols - len(row))
+        row.append("")
+
+        names = get_names(row)
+        primary = join_nonempty(names) or norm(names[0])
+        aliases = [v for v in (norm(x) for x in get_aliases(row)) if v]
+        address = join_nonempty(get_addr(row), sep=", ")
+        ids: List[str] = []
+        pnum = norm(row[i_pass])
+        nid  = norm(row[i_nid])
+        if pnum: ids.append(pnum)
+        if nid: ids.append(nid)
+        regime = norm(row[i_regime])
+        dob = norm(row[i_dob])
+        nat = norm(row[i_nat])
+
+        rec = Record(
+            source="UK-OFSI",
+            source_id=norm(row[i_gid]),
+            entity_type=norm(row[i_gtype]) or norm(row[i_type]) or None,
+            primary_name=primary,
+            aliases=aliases,
+            programs=[regime] if regime else [],
+            list_date=norm(row[i_listed]) or None,
+            last_updated=norm(row[i_upd]) or None,
+            dob=[dob] if dob else [],
+            nationalities=[nat] if nat else [],
+            addresses=[address] if address else [],
+            ids=ids,
+            remarks=norm(row[i_other]) or None,
+        )
+        rec.finalize()
+        if rec.primary_name:
+            lines.append(dumps_line(rec.to_dict()))
+            count += 1
+    return b"".join(lines), count
+
 def normalize_uk_csv(in_csv: Path, out_jsonl: Path) -> int:
+    # Pass 1: header detection only needs the first ~100 rows — no reason to
+    # hold the whole OFSI file in memory for it
+    head: List[List[str]] = []
     with in_csv.open("r", encoding="utf-8-sig", newline="") as f:
-        rows = list(csv.reader(f))
-    if not rows:
+        for i, row in enumerate(csv.reader(f)):
+            head.append(row)
+            if i >= 99:
+                break
+    if not head:
         print(f"[UK] No rows in {in_csv}")
         return 0
 
-    hdr_idx = find_header_row(rows)
+    hdr_idx = find_header_row(head)
     if hdr_idx is None:
         print(f"[UK] Could not detect header in {in_csv}; writing nothing.")
         return 0
 
-    headers = rows[hdr_idx]
-    idx = {h: i for i, h in enumerate(headers)}
+    headers = head[hdr_idx]
+
+    # Pass 2: stream data rows off the reader into 10k-row chunks. A single
+    # chunk is processed inline; larger files fan chunks out to worker
+    # processes (the per-record Unicode + regex work is CPU-bound and the
+    # records are independent), with the parent writing results in order.
+    # _write_chunked pulls chunks as it has pool capacity, so the file is
+    # never buffered whole.
+    def chunk_rows() -> Iterable[List[List[str]]]:
+        with in_csv.open("r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f)
+            for _ in range(hdr_idx + 1):
+                next(reader)
+            buf: List[List[str]] = []
+            for row in reader:
+                if not any(row):
+                    continue
+                buf.append(row)
+                if len(buf) >= _CHUNK_ROWS:
+                    yield buf
+                    buf = []
+            if buf:
+                yield buf
 
-    def get(row: List[str], key: str) -> str:
-        i = idx.get(key)
-        return row[i] if (i is not None and i < len(row)) else ""
-
-    count = 0
     out_jsonl.parent.mkdir(parents=True, exist_ok=True)
-    with out_jsonl.open("w", encoding="utf-8") as out:
-        for row in rows[hdr_idx + 1 :]:
-            if not any(row):
-                continue
-            primary = join_nonempty([get(row, f"Name {k}") for k in ["1","2","3","4","5","6"]]) or norm(get(row, "Name 1"))
-            aliases = []
-            for k in ["Name 2","Name 3","Name 4","Name 5","Name 6","Name Non-Latin Script"]:
-                v = norm(get(row, k))
-                if v:
-                    aliases.append(v)
-            address = join_nonempty([
-                get(row, "Address 1"), get(row, "Address 2"), get(row, "Address 3"),
-                get(row, "Address 4"), get(row, "Address 5"), get(row, "Address 6"),
-                get(row, "Post/Zip Code"), get(row, "Country")
-            ], sep=", ")
-            ids: List[str] = []
-            pnum = norm(get(row, "Passport Number"))
-            nid  = norm(get(row, "National Identification Number"))
-            if pnum: ids.append(pnum)
-            if nid: ids.append(nid)
-
-            rec = Record(
-                source="UK-OFSI",
-                source_id=norm(get(row, "Group ID")),
-                entity_type=norm(get(row, "Group Type")) or norm(get(row, "Type")) or None,
-                primary_name=primary,
-                aliases=aliases,
-                programs=[norm(get(row, "Regime"))] if norm(get(row, "Regime")) else [],
-                list_date=norm(get(row, "Listed On")) or None,
-                last_updated=norm(get(row, "Last Updated")) or None,
-                dob=[norm(get(row, "DOB"))] if norm(get(row, "DOB")) else [],
-                nationalities=[norm(get(row, "Nationality"))] if norm(get(row, "Nationality")) else [],
-                addresses=[address] if address else [],
-                ids=ids,
-                remarks=norm(get(row, "Other Information")) or None,
-            )
-            rec.finalize()
-            if rec.primary_name:
-                out.write(json.dumps(rec.to_dict(), ensure_ascii=False) + "\n")
-                count += 1
+    with out_jsonl.open("wb") as out:
+        count = _write_chunked(chunk_rows(), partial(_uk_rows_to_lines, headers), out)
     print(f"[UK] Wrote {count} records → {out_jsonl}")
     return count
 
@@ -159,59 +300,122 @@ def ts(parent: ET.Element, path: str) -> List[str]:
             vals.append(norm(x.text))
     return [v for v in vals if v]
 
-def parse_un_individual(ind: ET.Element) -> Record:
-    name = " ".join(filter(None, [t(ind, "FIRST_NAME"), t(ind, "SECOND_NAME"), t(ind, "THIRD_NAME"), t(ind, "FOURTH_NAME")])) or t(ind, "NAME")
-    aliases: List[str] = []
-    aka_list = ind.find("AKA_LIST")
-    if aka_list is not None:
-        for aka in aka_list.findall("AKA"):
-            alias = t(aka, "ALIAS_NAME")
-            if alias:
-                aliases.append(alias)
+_ADDR_PART_TAGS = ("STREET", "CITY", "STATE_PROVINCE", "ZIP_CODE", "COUNTRY")
 
-    programs: List[str] = []
-    des = ind.find("DESIGNATION")
-    if des is not None and des.text:
-        programs.append(norm(des.text))
-    programs += ts(ind, "LIST_TYPE")
+def _txt(el: ET.Element) -> str:
+    return norm(el.text) if el.text else ""
 
-    dobs: List[str] = []
-    for dob in ind.findall("INDIVIDUAL_DATE_OF_BIRTH"):
-        d = t(dob, "DATE")
-        if d:
-            dobs.append(d)
-        dobs += ts(dob, "YEAR")
-    if not dobs:
-        dobs = ts(ind, "DATE_OF_BIRTH")
+def _addr_from(adr: ET.Element) -> str:
+    # first occurrence of each part, emitted in canonical order (matches the
+    # old per-tag find calls)
+    got: Dict[str, str] = {}
+    for sub in adr:
+        if sub.tag in _ADDR_PART_TAGS and sub.tag not in got:
+            got[sub.tag] = _txt(sub)
+    return ", ".join(v for k in _ADDR_PART_TAGS if (v := got.get(k)))
 
+def parse_un_individual(ind: ET.Element) -> Record:
+    # One pass over the children with a tag switch instead of ~12 find/findall
+    # rescans of the same child list. Scalar fields keep find()'s
+    # first-occurrence semantics via the None sentinels.
+    first = second = third = fourth = name_tag = None
+    designation = dataid = refnum = last_day = last_upd = comments = None
+    list_types: List[str] = []
+    aliases: List[str] = []
+    dobs: List[str] = []
+    dob_fallback: List[str] = []
     nats: List[str] = []
-    for n in ind.findall("INDIVIDUAL_NATIONALITY"):
-        nats += ts(n, "NATIONALITY")
-
     addrs: List[str] = []
-    adrlist = ind.find("INDIVIDUAL_ADDRESS_LIST")
-    if adrlist is not None:
-        for adr in adrlist.findall("INDIVIDUAL_ADDRESS"):
-            parts = []
-            for tag in ["STREET", "CITY", "STATE_PROVINCE", "ZIP_CODE", "COUNTRY"]:
-                v = t(adr, tag)
-                if v:
-                    parts.append(v)
-            if parts:
-                addrs.append(", ".join(parts))
-
     ids: List[str] = []
-    for doc in ind.findall("INDIVIDUAL_DOCUMENT"):
-        num = t(doc, "NUMBER")
-        if num:
-            ids.append(num)
-
-    last_updated = t(ind, "LAST_DAY_UPDATED") or t(ind, "LAST_UPDATE")
-    remarks = t(ind, "COMMENTS1")
+    aka_seen = addrlist_seen = False
+
+    for child in ind:
+        tag = child.tag
+        if tag == "FIRST_NAME":
+            if first is None: first = _txt(child)
+        elif tag == "SECOND_NAME":
+            if second is None: second = _txt(child)
+        elif tag == "THIRD_NAME":
+            if third is None: third = _txt(child)
+        elif tag == "FOURTH_NAME":
+            if fourth is None: fourth = _txt(child)
+        elif tag == "NAME":
+            if name_tag is None: name_tag = _txt(child)
+        elif tag == "AKA_LIST":
+            if not aka_seen:
+                aka_seen = True
+                for aka in child:
+                    if aka.tag != "AKA":
+                        continue
+                    alias = None
+                    for sub in aka:
+                        if sub.tag == "ALIAS_NAME":
+                            alias = _txt(sub)
+                            break
+                    if alias:
+                        aliases.append(alias)
+        elif tag == "DESIGNATION":
+            if designation is None:
+                designation = _txt(child)
+        elif tag == "LIST_TYPE":
+            if child.text and (v := norm(child.text)):
+                list_types.append(v)
+        elif tag == "INDIVIDUAL_DATE_OF_BIRTH":
+            date = None
+            years: List[str] = []
+            for sub in child:
+                if sub.tag == "DATE":
+                    if date is None: date = _txt(sub)
+                elif sub.tag == "YEAR" and sub.text and (v := norm(sub.text)):
+                    years.append(v)
+            if date:
+                dobs.append(date)
+            dobs += years
+        elif tag == "DATE_OF_BIRTH":
+            if child.text and (v := norm(child.text)):
+                dob_fallback.append(v)
+        elif tag == "INDIVIDUAL_NATIONALITY":
+            for sub in child:
+                if sub.tag == "NATIONALITY" and sub.text and (v := norm(sub.text)):
+                    nats.append(v)
+        elif tag == "INDIVIDUAL_ADDRESS_LIST":
+            if not addrlist_seen:
+                addrlist_seen = True
+                for adr in child:
+                    if adr.tag == "INDIVIDUAL_ADDRESS" and (a := _addr_from(adr)):
+                        addrs.append(a)
+        elif tag == "INDIVIDUAL_DOCUMENT":
+            num = None
+            for sub in child:
+                if sub.tag == "NUMBER":
+                    num = _txt(sub)
+                    break
+            if num:
+                ids.append(num)
+        elif tag == "LAST_DAY_UPDATED":
+            if last_day is None: last_day = _txt(child)
+        elif tag == "LAST_UPDATE":
+            if last_upd is None: last_upd = _txt(child)
+        elif tag == "COMMENTS1":
+            if comments is None: comments = _txt(child)
+        elif tag == "DATAID":
+            if dataid is None: dataid = _txt(child)
+        elif tag == "REFERENCE_NUMBER":
+            if refnum is None: refnum = _txt(child)
+
+    name = " ".join(filter(None, [first, second, third, fourth])) or (name_tag or "")
+    programs: List[str] = []
+    if designation:
+        programs.append(designation)
+    programs += list_types
+    if not dobs:
+        dobs = dob_fallback
+    last_updated = (last_day or "") or (last_upd or "")
+    remarks = comments or ""
 
     rec = Record(
         source="UN-SECURITY-COUNCIL",
-        source_id=t(ind, "DATAID") or t(ind, "REFERENCE_NUMBER"),
+        source_id=(dataid or "") or (refnum or ""),
         entity_type="person",
         primary_name=name,
         aliases=aliases,
@@ -228,45 +432,76 @@ def parse_un_individual(ind: ET.Element) -> Record:
     return rec
 
 def parse_un_entity(ent: ET.Element) -> Record:
-    name = t(ent, "FIRST_NAME") or t(ent, "NAME")
+    # Same single-pass tag switch as parse_un_individual
+    first = name_tag = None
+    designation = dataid = refnum = last_day = last_upd = comments = None
+    list_types: List[str] = []
     aliases: List[str] = []
-    aka_list = ent.find("AKA_LIST")
-    if aka_list is not None:
-        for aka in aka_list.findall("AKA"):
-            alias = t(aka, "ALIAS_NAME")
-            if alias:
-                aliases.append(alias)
-
-    programs: List[str] = []
-    des = ent.find("DESIGNATION")
-    if des is not None and des.text:
-        programs.append(norm(des.text))
-    programs += ts(ent, "LIST_TYPE")
-
     addrs: List[str] = []
-    adrlist = ent.find("ENTITY_ADDRESS_LIST")
-    if adrlist is not None:
-        for adr in adrlist.findall("ENTITY_ADDRESS"):
-            parts = []
-            for tag in ["STREET", "CITY", "STATE_PROVINCE", "ZIP_CODE", "COUNTRY"]:
-                v = t(adr, tag)
-                if v:
-                    parts.append(v)
-            if parts:
-                addrs.append(", ".join(parts))
-
     ids: List[str] = []
-    for doc in ent.findall("ENTITY_DOCUMENT"):
-        num = t(doc, "NUMBER")
-        if num:
-            ids.append(num)
-
-    last_updated = t(ent, "LAST_DAY_UPDATED") or t(ent, "LAST_UPDATE")
-    remarks = t(ent, "COMMENTS1")
+    aka_seen = addrlist_seen = False
+
+    for child in ent:
+        tag = child.tag
+        if tag == "FIRST_NAME":
+            if first is None: first = _txt(child)
+        elif tag == "NAME":
+            if name_tag is None: name_tag = _txt(child)
+        elif tag == "AKA_LIST":
+            if not aka_seen:
+                aka_seen = True
+                for aka in child:
+                    if aka.tag != "AKA":
+                        continue
+                    alias = None
+                    for sub in aka:
+                        if sub.tag == "ALIAS_NAME":
+                            alias = _txt(sub)
+                            break
+                    if alias:
+                        aliases.append(alias)
+        elif tag == "DESIGNATION":
+            if designation is None:
+                designation = _txt(child)
+        elif tag == "LIST_TYPE":
+            if child.text and (v := norm(child.text)):
+                list_types.append(v)
+        elif tag == "ENTITY_ADDRESS_LIST":
+            if not addrlist_seen:
+                addrlist_seen = True
+                for adr in child:
+                    if adr.tag == "ENTITY_ADDRESS" and (a := _addr_from(adr)):
+                        addrs.append(a)
+        elif tag == "ENTITY_DOCUMENT":
+            num = None
+            for sub in child:
+                if sub.tag == "NUMBER":
+                    num = _txt(sub)
+                    break
+            if num:
+                ids.append(num)
+        elif tag == "LAST_DAY_UPDATED":
+            if last_day is None: last_day = _txt(child)
+        elif tag == "LAST_UPDATE":
+            if last_upd is None: last_upd = _txt(child)
+        elif tag == "COMMENTS1":
+            if comments is None: comments = _txt(child)
+        elif tag == "DATAID":
+            if dataid is None: dataid = _txt(child)
+        elif tag == "REFERENCE_NUMBER":
+            if refnum is None: refnum = _txt(child)
+
+    name = (first or "") or (name_tag or "")
+    programs: List[str] = []
+    if designation:
+        programs.append(designation)
+    programs += list_types
+    last_updated = (last_day or "") or (last_upd or "")
+    remarks = comments or ""
 
     rec = Record(
         source="UN-SECURITY-COUNCIL",
-        source_id=t(ent, "DATAID") or t(ent, "REFERENCE_NUMBER"),
+        source_id=(dataid or "") or (refnum or ""),
         entity_type="organization",
         primary_name=name,
         aliases=aliases,
@@ -282,21 +517,125 @@ def parse_un_entity(ent: ET.Element) -> Record:
     rec.finalize()
     return rec
 
+class _UNRecordTarget:
+    """
+    XMLParser target for the stdlib fallback: builds an Element subtree only
+    while inside an INDIVIDUAL or ENTITY, and discards everything else as it
+    streams past. No document-level DOM is ever constructed, so the no-lxml
+    path runs in flat memory like the lxml one.
+    """
+    RECORD_TAGS = ("INDIVIDUAL", "ENTITY")
+
+    def __init__(self) -> None:
+        self.records: List[ET.Element] = []  # completed subtrees, drained by the caller
+        self._tb: Optional[ET.TreeBuilder] = None
+        self._depth = 0
+
+    def start(self, tag: str, attrs: Dict[str, str]) -> None:
+        if self._tb is None:
+            if tag not in self.RECORD_TAGS:
+                return
+            self._tb = ET.TreeBuilder()
+            self._depth = 0
+        self._tb.start(tag, attrs)
+        self._depth += 1
+
+    def data(self, d: str) -> None:
+        if self._tb is not None:
+            self._tb.data(d)
+
+    def end(self, tag: str) -> None:
+        if self._tb is None:
+            return
+        elem = self._tb.end(tag)
+        self._depth -= 1
+        if self._depth == 0:
+            self.records.append(elem)
+            self._tb = None
+
+    def close(self) -> None:
+        pass
+
+def _iter_un_records(in_xml: Path) -> Iterable[Record]:
+    """
+    Yield parsed Records from the UN consolidated list in document order.
+    Streams with lxml iterparse, clearing each element (and its already-
+    consumed siblings) after parsing so memory stays flat instead of holding
+    the whole DOM; without lxml, a _UNRecordTarget parser streams the file in
+    64KB reads and builds only the per-record subtrees parse_un_* operate on.
+    """
+    try:
+        from lxml import etree
+    except ImportError:
+        target = _UNRecordTarget()
+        parser = ET.XMLParser(target=target)
+        with in_xml.open("rb") as f:
+            while chunk := f.read(1 << 16):
+                parser.feed(chunk)
+                for elem in target.records:
+                    yield parse_un_individual(elem) if elem.tag == "INDIVIDUAL" else parse_un_entity(elem)
+                target.records.clear()
+        parser.close()
+        for elem in target.records:
+            yield parse_un_individual(elem) if elem.tag == "INDIVIDUAL" else parse_un_entity(elem)
+        return
+    for _, elem in etree.iterparse(str(in_xml), events=("end",), tag=("INDIVIDUAL", "ENTITY")):
+        yield parse_un_individual(elem) if elem.tag == "INDIVIDUAL" else parse_un_entity(elem)
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+def _un_fragments_to_lines(frags: List[bytes]) -> tuple[bytes, int]:
+    """
+    Parse one chunk of serialized <INDIVIDUAL>/<ENTITY> fragments into JSONL
+    bytes. Elements don't pickle, so the parent ships each record's raw XML
+    (a cheap C-level tostring) and workers re-parse the small fragments.
+    """
+    lines: List[bytes] = []
+    count = 0
+    for data in frags:
+        elem = ET.fromstring(data)
+        rec = parse_un_individual(elem) if elem.tag == "INDIVIDUAL" else parse_un_entity(elem)
+        if rec.primary_name:
+            lines.append(dumps_line(rec.to_dict()))
+            count += 1
+    return b"".join(lines), count
+
 def normalize_un_xml(in_xml: Path, out_jsonl: Path) -> int:
-    root = ET.parse(in_xml).getroot()
     count = 0
     out_jsonl.parent.mkdir(parents=True, exist_ok=True)
-    with out_jsonl.open("w", encoding="utf-8") as out:
-        for ind in root.findall(".//INDIVIDUALS/INDIVIDUAL"):
-            rec = parse_un_individual(ind)
-            if rec.primary_name:
-                out.write(json.dumps(rec.to_dict(), ensure_ascii=False) + "\n")
-                count += 1
-        for ent in root.findall(".//ENTITIES/ENTITY"):
-            rec = parse_un_entity(ent)
-            if rec.primary_name:
-                out.write(json.dumps(rec.to_dict(), ensure_ascii=False) + "\n")
-                count += 1
+    try:
+        from lxml import etree
+    except ImportError:
+        etree = None
+    with out_jsonl.open("wb") as out:
+        if etree is None:
+            # serial DOM fallback
+            for rec in _iter_un_records(in_xml):
+                if rec.primary_name:
+                    out.write(dumps_line(rec.to_dict()))
+                    count += 1
+        else:
+            # stream fragments off iterparse into 10k-record chunks; one
+            # chunk runs inline, larger lists fan out to worker processes
+            # (per-record Unicode + regex work is the CPU cost here).
+            # _write_chunked pulls from the generator as it has pool
+            # capacity, so the cleared-element iterparse window stays the
+            # only whole-document state.
+            def chunk_frags() -> Iterable[List[bytes]]:
+                buf: List[bytes] = []
+                for _, elem in etree.iterparse(str(in_xml), events=("end",), tag=("INDIVIDUAL", "ENTITY")):
+                    buf.append(etree.tostring(elem))
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del elem.getparent()[0]
+                    if len(buf) >= _CHUNK_ROWS:
+                        yield buf
+                        buf = []
+                if buf:
+                    yield buf
+
+            count = _write_chunked(chunk_frags(), _un_fragments_to_lines, out)
     print(f"[UN] Wrote {count} records → {out_jsonl}")
     return count
 
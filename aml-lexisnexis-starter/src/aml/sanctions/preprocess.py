@@ -1,5 +1,6 @@
 # src/aml/sanctions/preprocess.py
 from __future__ import annotations
+import functools
 import re
 import unicodedata
 
@@ -59,6 +60,27 @@ _FANCY_MAP = {
 def _normalize_fancy_punct_spaces(t: str) -> str:
     return t.translate(str.maketrans(_FANCY_MAP))
 
+# Single codepoint table fusing three passes of the matching pipeline: fancy
+# punctuation/space mapping, selected-punctuation→space, and zero-width
+# removal. One str.translate (a C loop) replaces two regex subs + two
+# translates per string.
+_PUNCT_CHARS = (
+    "-_'`,.;:(){}[]/\\"
+    + "".join(chr(c) for c in range(0x2010, 0x2016))  # hyphen/horizontal bars
+    + "−·"                                  # minus, middle dot
+)
+
+def _build_fused_trans() -> dict[int, str | None]:
+    table: dict[int, str | None] = {ord(c): " " for c in _PUNCT_CHARS}
+    for k, v in _FANCY_MAP.items():
+        # fancy chars whose ASCII form is itself punctuation end up as space,
+        # matching the original fancy-then-punct pass order
+        table[ord(k)] = " " if v in _PUNCT_CHARS else v
+    table.update(_ZW)
+    return table
+
+_FUSED_TRANS = _build_fused_trans()
+
 # ---------------------------------------------------------------------------
 # Public functions
 # ---------------------------------------------------------------------------
@@ -67,12 +89,17 @@ def normalize_unicode(text: str | None, form: str = "NFKC") -> str:
     """Unicode normalize + remove zero-width chars."""
     if not text:
         return ""
-    t = unicodedata.normalize(form, str(text))
-    t = t.translate(_ZW)
-    return t
+    t = str(text)
+    # quick-check (TR #15): already-normalized input — the common case for
+    # ASCII CSV rows — skips the rebuild-and-reallocate pass entirely
+    if not unicodedata.is_normalized(form, t):
+        t = unicodedata.normalize(form, t)
+    return t.translate(_ZW)
 
 def strip_diacritics(text: str) -> str:
     """Remove diacritics by decomposing to NFKD, dropping combining marks, recompose to NFC."""
+    if text.isascii():
+        return text  # ASCII carries no combining marks; NFKD/NFC are no-ops
     d = unicodedata.normalize("NFKD", text)
     d = _COMBINING_MARK.sub("", d)
     return unicodedata.normalize("NFC", d)
@@ -87,23 +114,40 @@ def collapse_punct_ws(text: str) -> str:
     t = _WS_COLLAPSE.sub(" ", t).strip()
     return t
 
+@functools.lru_cache(maxsize=200_000)
+def _norm_for_matching_cached(text: str) -> str:
+    if text.isascii():
+        # ASCII (the bulk of UK/UN name data): NFKC and diacritic stripping
+        # are identity transforms, so the pipeline reduces to escape-strip +
+        # fused translate + casefold + whitespace collapse
+        t = _strip_literal_u_escapes(text)
+        t = t.translate(_FUSED_TRANS)
+        t = t.casefold()
+        return _WS_COLLAPSE.sub(" ", t).strip()
+    t = unicodedata.normalize("NFKC", text)
+    t = _strip_literal_u_escapes(t)
+    t = t.translate(_FUSED_TRANS)  # fancy punct + punct→space + zero-widths
+    t = strip_diacritics(t)
+    t = t.casefold()
+    return _WS_COLLAPSE.sub(" ", t).strip()
+
 def norm_for_matching(text: str | None) -> str:
     """
     Opinionated pipeline used by screening & KB:
-      1) Unicode NFKC (plus remove zero-widths)
+      1) Unicode NFKC
       2) Strip literal \\uXXXX escapes (e.g., \\u200B) if present as text
-      3) Normalize fancy quotes/apostrophes & space chars to ASCII
+      3) Fused translate: fancy quotes/spaces → ASCII, selected punctuation
+         → spaces, zero-widths removed (one C pass, see _FUSED_TRANS)
       4) Strip diacritics (Latin etc.)
       5) Casefold
-      6) Collapse selected punctuation to spaces
-      7) Collapse whitespace
+      6) Collapse whitespace
+
+    Memoized: the same names recur across ingest and screening, so repeat
+    calls are a dict hit.
     """
     if not text:
         return ""
-    t = normalize_unicode(text, "NFKC")
-    t = _strip_literal_u_escapes(t)
-    t = _normalize_fancy_punct_spaces(t)
-    t = strip_diacritics(t)
-    t = casefold_text(t)
-    t = collapse_punct_ws(t)
-    return t
+    return _norm_for_matching_cached(str(text))
+
+# let tests reset the memo without reaching for the private inner function
+norm_for_matching.cache_clear = _norm_for_matching_cached.cache_clear  # type: ignore[attr-defined]
@@ -1,20 +1,44 @@
 # src/aml/sanctions/screen.py  (only the changes vs your last working file)
 from __future__ import annotations
 
+import heapq
+import json
 import sqlite3, os
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Any, List, Tuple, Optional
 
 import numpy as np
 
 from aml.sanctions.preprocess import norm_for_matching
 from aml.sanctions.features_text import levenshtein_norm, jaro_winkler, token_overlap
+from aml.sanctions import features_text_numba as _ftn
 from aml.sanctions.features_context import (
     dob_match as ctx_dob_match, country_match as ctx_country_match, id_soft_match as ctx_id_soft_match
 )
-from aml.sanctions.features_embed import encode_name, cosine_sim
+from aml.sanctions.features_embed import (
+    encode_name, encode_names, cosine_sim, cosine_sim_int8_sym, load_kb_vectors
+)
+
+try:
+    # one C++ cdist call per feature across all candidates, instead of a
+    # Python similarity call per row (features_text has the same fallback split)
+    from rapidfuzz.distance import JaroWinkler as _RFJaroWinkler
+    from rapidfuzz.distance import Levenshtein as _RFLevenshtein
+    from rapidfuzz.process import cdist as _rf_cdist
+except ImportError:
+    _rf_cdist = None
+
+# --- helpers for schema variance (_has_column, _address_select_expr) ---
+
+def _has_column(con: sqlite3.Connection, table: str, col: str) -> bool:
+    return any(r[1] == col for r in con.execute(f"PRAGMA table_info({table})"))
 
-# --- helpers for schema variance remain as you added earlier (_has_column, _address_select_expr) ---
+def _address_select_expr(con: sqlite3.Connection) -> str:
+    # older KBs stored a singular `address` column; current schema uses `addresses`
+    if _has_column(con, "entities", "addresses"):
+        return "e.addresses AS address"
+    return "e.address AS address"
 
 @dataclass
 class NameMatchConfig:
@@ -32,18 +56,87 @@ class NameMatchConfig:
     block_threshold: float = 0.93
     clear_threshold: float = 0.70
 
-def _read_vec(blob: bytes) -> np.ndarray:
-    if blob is None:
-        return None
-    v = np.frombuffer(blob, dtype=np.float32)
-    return v.reshape(1, -1)
-
 def name_text_features(qn: str, pnorm: str) -> Dict[str, float]:
     q = norm_for_matching(qn); p = norm_for_matching(pnorm)
     return {"lev": levenshtein_norm(q, p), "jw": jaro_winkler(q, p), "tok": token_overlap(q, p)}
 
+@lru_cache(maxsize=4096)
 def _fts_query(qn_raw: str, name_raw: str) -> str:
-    return f'normalized_name:"{qn_raw}" OR primary_name:"{name_raw}"'
+    # Doubling embedded quotes keeps user input inside the FTS5 phrase —
+    # bare quotes/operators would otherwise be parsed as query syntax.
+    # Memoized because the same names recur across screening batches, and
+    # SQLite re-parses the MATCH expression on every call.
+    qn = qn_raw.replace('"', '""')
+    nm = name_raw.replace('"', '""')
+    return f'normalized_name:"{qn}" OR primary_name:"{nm}"'
+
+def _matrix_path_for(db_path: str) -> str:
+    return os.path.splitext(db_path)[0] + ".name_vecs.npy"
+
+@lru_cache(maxsize=4)
+def _load_vec_matrix(db_path: str):
+    """
+    Memory-mapped (N, D) vector matrix + entity_id -> row_idx map, written by
+    scripts/export_vector_matrix.py. Returns None when the KB has no exported
+    matrix, in which case screen() falls back to the per-row BLOB column.
+    """
+    path = _matrix_path_for(db_path)
+    stem = os.path.splitext(path)[0]
+    int8_path, scales_path = stem + ".int8.npy", stem + ".scales.npy"
+    have_int8 = os.path.exists(int8_path) and os.path.exists(scales_path)
+    if not have_int8 and not os.path.exists(path):
+        return None
+    con = sqlite3.connect(db_path)
+    try:
+        try:
+            rows = con.execute("SELECT entity_id, row_idx FROM entity_vec_index").fetchall()
+        except sqlite3.OperationalError:
+            return None
+    finally:
+        con.close()
+    eid_to_row = {eid: ri for eid, ri in rows}
+    if have_int8:
+        # 4x less bandwidth per scan; int8 dots rescale exactly (see
+        # cosine_sim_int8_sym), fp32 matrix not needed at query time
+        return "int8", (np.load(int8_path, mmap_mode="r"), np.load(scales_path)), eid_to_row
+    return "fp32", (load_kb_vectors(path),), eid_to_row
+
+@lru_cache(maxsize=4)
+def _load_block_index(db_path: str):
+    """
+    In-memory blocking index over normalized_name, built once per process:
+    token -> entity_ids for exact-token hits, plus 4-char token prefixes for
+    typo tolerance. Candidate lookup is then dict probes in L2/L3 instead of
+    an FTS5 parse/plan/execute round-trip per query.
+    """
+    con = sqlite3.connect(db_path)
+    try:
+        rows = con.execute("SELECT entity_id, normalized_name FROM entities").fetchall()
+    finally:
+        con.close()
+    by_token: Dict[str, List[int]] = {}
+    by_prefix: Dict[str, List[int]] = {}
+    for eid, nn in rows:
+        for t in set((nn or "").split()):
+            by_token.setdefault(t, []).append(eid)
+            if len(t) > 4:
+                by_prefix.setdefault(t[:4], []).append(eid)
+    return by_token, by_prefix
+
+def _block_candidates(q_norm: str, db_path: str, topk: int = 50) -> List[int]:
+    """Candidate entity_ids for q_norm: exact token hits count double,
+    prefix hits single; keep the topk best-supported ids."""
+    by_token, by_prefix = _load_block_index(db_path)
+    support: Dict[int, int] = {}
+    for t in set(q_norm.split()):
+        for eid in by_token.get(t, ()):
+            support[eid] = support.get(eid, 0) + 2
+        if len(t) > 4:
+            for eid in by_prefix.get(t[:4], ()):
+                support[eid] = support.get(eid, 0) + 1
+    if len(support) <= topk:
+        return list(support)
+    return heapq.nlargest(topk, support, key=support.get)
 
 def _faiss_candidates(q_vec: np.ndarray, index_path: Optional[str], ids_path: Optional[str], topk: int = 50) -> List[int]:
     if not index_path or not ids_path:
@@ -62,119 +155,212 @@ def _faiss_candidates(q_vec: np.ndarray, index_path: Optional[str], ids_path: Op
     except Exception:
         return []
 
-def screen(
-    name: str,
+def screen_batch(
+    names: List[str],
     k: int = 10,
     db_path: str = "data/external/sanctions/kb.sqlite",
-    context: Optional[Dict[str, Any]] = None,
+    contexts: Optional[List[Optional[Dict[str, Any]]]] = None,
     cfg: NameMatchConfig | None = None,
     # optional FAISS inputs
     faiss_index_path: Optional[str] = None,
     faiss_ids_path: Optional[str] = None,
-) -> Dict[str, Any]:
+) -> List[Dict[str, Any]]:
+    """
+    Screen many names in one pass. All queries share a single candidate pool:
+    one SQL IN-fetch, one (B, D) encode, one gemm against the pooled vectors
+    and one cdist per text feature, instead of repeating the per-query setup
+    B times. Returns one result dict per input name, same shape as screen().
+    """
     cfg = cfg or NameMatchConfig()
-    q_norm = norm_for_matching(name)
-    q_vec = encode_name(q_norm)  # (1, D), L2-normalized
+    if not names:
+        return []
+    contexts = contexts if contexts is not None else [None] * len(names)
+    q_norms = [norm_for_matching(n) for n in names]
+    Q = encode_names(q_norms)  # (B, D), L2-normalized
+
+    pool: Dict[int, sqlite3.Row] = {}
+    per_query: List[List[int]] = []
 
     con = sqlite3.connect(db_path)
     con.row_factory = sqlite3.Row
     try:
-        # 1) FTS5 candidates
         addr_expr = _address_select_expr(con)
-        sql = f"""
-            SELECT e.entity_id, e.primary_name, e.normalized_name, e.entity_type, e.programs, e.source,
-                   e.dob, e.nationalities, e.ids, {addr_expr}, e.name_vec
+        # token sets are materialized at ingest by current loaders; older KBs
+        # fall back to splitting normalized_name below
+        tok_expr = ("e.name_tokens AS name_tokens"
+                    if _has_column(con, "entities", "name_tokens")
+                    else "NULL AS name_tokens")
+        canon_expr = ("e.nationalities_canon AS nationalities_canon"
+                      if _has_column(con, "entities", "nationalities_canon")
+                      else "NULL AS nationalities_canon")
+        base_cols = f"""e.entity_id, e.primary_name, e.normalized_name, e.entity_type, e.programs, e.source,
+                   e.dob, e.nationalities, e.ids, {addr_expr}, {tok_expr}, {canon_expr}, v.vec AS name_vec"""
+        sql_by_ids = (f"SELECT {base_cols} FROM entities e"
+                      " LEFT JOIN entity_vectors v ON v.entity_id = e.entity_id"
+                      " WHERE e.entity_id IN ({qmarks})")
+        sql_fts = f"""
+            SELECT {base_cols}
               FROM entity_fts
               JOIN entities e ON e.entity_id = entity_fts.rowid
+              LEFT JOIN entity_vectors v ON v.entity_id = e.entity_id
              WHERE entity_fts MATCH ?
              LIMIT 50
         """
-        fts_rows = con.execute(sql, (_fts_query(q_norm, name),)).fetchall()
 
-        # 2) (optional) FAISS candidates for recall
-        faiss_eids = set(_faiss_candidates(q_vec, faiss_index_path, faiss_ids_path, topk=50))
+        # 1) Candidates per query: in-memory blocking first, FTS5 MATCH as
+        #    the fallback for KBs without normalized_name populated; optional
+        #    FAISS ids merge in for recall
+        for b, (name, qn) in enumerate(zip(names, q_norms)):
+            cand = _block_candidates(qn, db_path, topk=50)
+            if not cand:
+                rows = con.execute(sql_fts, (_fts_query(qn, name),)).fetchall()
+                for r in rows:
+                    pool.setdefault(r["entity_id"], r)
+                cand = [r["entity_id"] for r in rows]
+            faiss_eids = _faiss_candidates(Q[b:b + 1], faiss_index_path, faiss_ids_path, topk=50)
+            per_query.append(list(dict.fromkeys([*cand, *faiss_eids])))
 
-        # 3) If FAISS brought extra entity_ids not in FTS – fetch them
-        existing_ids = {r["entity_id"] for r in fts_rows}
-        missing = list(faiss_eids - existing_ids)
-        faiss_rows = []
+        # 2) One IN-fetch for every candidate not already pooled
+        missing = list(dict.fromkeys(
+            eid for ids in per_query for eid in ids if eid not in pool))
         if missing:
             qmarks = ",".join("?" for _ in missing)
-            faiss_rows = con.execute(f"""
-                SELECT e.entity_id, e.primary_name, e.normalized_name, e.entity_type, e.programs, e.source,
-                       e.dob, e.nationalities, e.ids, {addr_expr}, e.name_vec
-                  FROM entities e
-                 WHERE e.entity_id IN ({qmarks})
-            """, missing).fetchall()
-
-        rows = list(fts_rows) + list(faiss_rows)
+            for r in con.execute(sql_by_ids.format(qmarks=qmarks), missing):
+                pool[r["entity_id"]] = r
     finally:
         con.close()
 
-    # De-dupe by entity_id (keep first occurrence)
-    seen = set(); uniq_rows = []
-    for r in rows:
-        eid = r["entity_id"]
-        if eid in seen: continue
-        seen.add(eid); uniq_rows.append(r)
-
-    scored = []
-    for r in uniq_rows:
-        pname = r["primary_name"]
-        pnorm_eff = r["normalized_name"] or norm_for_matching(pname or "")
-        text_feats = name_text_features(q_norm, pnorm_eff)
-        text_score = cfg.w_jw*text_feats["jw"] + cfg.w_lev*text_feats["lev"] + cfg.w_tok*text_feats["tok"]
-
-        # Embedding cosine (if entity has a vector)
-        embed_cos = 0.0
-        p_blob = r["name_vec"]
-        if p_blob:
-            p_vec = _read_vec(p_blob)  # (1, D)
-            embed_cos = float((p_vec @ q_vec.T).ravel()[0])  # both L2-normalized
-
-        # Context features
-        ctx_feats = {"ctx_dob":0,"ctx_country":0,"ctx_id_soft":0}
-        try:
-            ctx_feats["ctx_dob"] = ctx_dob_match((context or {}).get("dob"), r["dob"])
-            ctx_feats["ctx_country"] = ctx_country_match((context or {}).get("country"), r["nationalities"], r["address"])
-            ctx_feats["ctx_id_soft"] = ctx_id_soft_match((context or {}).get("id_number"), r["ids"])
-        except Exception:
-            pass
-
-        ctx_bonus = cfg.w_ctx_dob*ctx_feats["ctx_dob"] + cfg.w_ctx_country*ctx_feats["ctx_country"] + cfg.w_ctx_id_soft*ctx_feats["ctx_id_soft"]
-
-        final = text_score + cfg.w_embed*max(0.0, embed_cos) + ctx_bonus
-        final = max(0.0, min(1.0, final))  # clamp
-
-        scored.append((
-            final, text_score, embed_cos, ctx_bonus, text_feats, ctx_feats, r
-        ))
-
-    scored.sort(key=lambda x: x[0], reverse=True)
-    top = []
-    for final, text_score, embed_cos, ctx_bonus, text_feats, ctx_feats, r in scored[:k]:
-        feats = {**{k: round(v,6) for k,v in text_feats.items()}, "embed_cos": round(embed_cos,6)}
-        top.append({
-            "entity_id": r["entity_id"],
-            "primary_name": r["primary_name"],
-            "score": round(final, 6),
-            "text_score": round(text_score, 6),
-            "context_bonus": round(ctx_bonus, 6),
-            "features": feats,
-            "context_features": ctx_feats,
-            "entity_type": r["entity_type"],
-            "programs": r["programs"],
-            "source": r["source"],
-            "dob": r["dob"],
-            "nationalities": r["nationalities"],
-            "ids": r["ids"],
-            "address": r["address"],
-        })
-
-    decision = "review"
-    if top:
-        best = top[0]["score"]
-        if best >= cfg.block_threshold: decision = "block"
-        elif best <= cfg.clear_threshold: decision = "clear"
-
-    return {"query": name, "context_used": context, "decision": decision, "top_hits": top}
+    pool_ids = list(pool)
+    pos_of = {eid: j for j, eid in enumerate(pool_ids)}
+    pool_rows = [pool[eid] for eid in pool_ids]
+    # normalized_name is guaranteed populated by the KB loader
+    pnorms = [r["normalized_name"] or "" for r in pool_rows]
+
+    # Embedding cosines, all queries x all pooled candidates in one gemm.
+    # Preferred source is the exported mmap'd matrix (SoA: no SQLite blob
+    # copies); per-row name_vec blobs remain the fallback.
+    cos_mat = np.zeros((len(names), len(pool_rows)), dtype=np.float32)
+    mat = _load_vec_matrix(db_path)
+    if mat is not None:
+        kind, store, eid_to_row = mat
+        take = [(j, eid_to_row[eid]) for j, eid in enumerate(pool_ids) if eid in eid_to_row]
+        if take:
+            ridx = np.fromiter((ri for _, ri in take), dtype=np.int64, count=len(take))
+            cols = np.fromiter((j for j, _ in take), dtype=np.int64, count=len(take))
+            if kind == "int8":
+                q_codes, scales = store[0][ridx], store[1][ridx]
+                for b in range(len(names)):
+                    cos_mat[b, cols] = cosine_sim_int8_sym(Q[b], q_codes, scales)
+            else:
+                cos_mat[:, cols] = (store[0][ridx] @ Q.T.astype(np.float32)).T  # (N, B) -> (B, N)
+    else:
+        blobs = [(j, r["name_vec"]) for j, r in enumerate(pool_rows) if r["name_vec"]]
+        if blobs:
+            D = len(blobs[0][1]) // 4  # float32 bytes per dim
+            M = np.empty((len(blobs), D), dtype=np.float32)
+            cols = np.empty(len(blobs), dtype=np.int64)
+            for pos, (j, blob) in enumerate(blobs):
+                M[pos] = np.frombuffer(blob, dtype=np.float32)
+                cols[pos] = j
+            cos_mat[:, cols] = (M @ Q.T.astype(np.float32)).T
+
+    # Text features, all queries x all pooled candidates (SIMD cdist when
+    # rapidfuzz is installed, numba kernels next, per-pair Python last)
+    if _rf_cdist is not None and pnorms:
+        jw_mat = _rf_cdist(q_norms, pnorms, scorer=_RFJaroWinkler.normalized_similarity, workers=-1)
+        lev_mat = _rf_cdist(q_norms, pnorms, scorer=_RFLevenshtein.normalized_similarity, workers=-1)
+    elif _ftn.HAVE_NUMBA and pnorms:
+        p_mat, p_lens = _ftn.codepoint_matrix(pnorms)
+        jw_mat = [_ftn.jaro_winkler_many(_ftn.to_codepoints(qn), p_mat, p_lens) for qn in q_norms]
+        lev_mat = [_ftn.lev_norm_many(_ftn.to_codepoints(qn), p_mat, p_lens) for qn in q_norms]
+    else:
+        jw_mat = [[jaro_winkler(qn, p) for p in pnorms] for qn in q_norms]
+        lev_mat = [[levenshtein_norm(qn, p) for p in pnorms] for qn in q_norms]
+    ptoks_pool = [
+        frozenset(json.loads(r["name_tokens"])) if r["name_tokens"] else frozenset(p.split())
+        for r, p in zip(pool_rows, pnorms)
+    ]
+
+    results = []
+    for b, name in enumerate(names):
+        context = contexts[b]
+        qtoks = frozenset(q_norms[b].split())
+        scored = []
+        for eid in per_query[b]:
+            j = pos_of.get(eid)
+            if j is None:
+                continue  # FAISS id with no matching entities row
+            r = pool_rows[j]
+            ptoks = ptoks_pool[j]
+            union = qtoks | ptoks
+            tok = len(qtoks & ptoks) / len(union) if union else 1.0
+            text_feats = {"lev": float(lev_mat[b][j]), "jw": float(jw_mat[b][j]), "tok": tok}
+            text_score = cfg.w_jw*text_feats["jw"] + cfg.w_lev*text_feats["lev"] + cfg.w_tok*text_feats["tok"]
+
+            embed_cos = float(cos_mat[b, j])
+
+            # Context features
+            ctx_feats = {"ctx_dob":0,"ctx_country":0,"ctx_id_soft":0}
+            try:
+                ctx_feats["ctx_dob"] = ctx_dob_match((context or {}).get("dob"), r["dob"])
+                ctx_feats["ctx_country"] = ctx_country_match(
+                    (context or {}).get("country"), r["nationalities"], r["address"],
+                    r["nationalities_canon"])
+                ctx_feats["ctx_id_soft"] = ctx_id_soft_match((context or {}).get("id_number"), r["ids"])
+            except Exception:
+                pass
+
+            ctx_bonus = cfg.w_ctx_dob*ctx_feats["ctx_dob"] + cfg.w_ctx_country*ctx_feats["ctx_country"] + cfg.w_ctx_id_soft*ctx_feats["ctx_id_soft"]
+
+            final = text_score + cfg.w_embed*max(0.0, embed_cos) + ctx_bonus
+            final = max(0.0, min(1.0, final))  # clamp
+
+            scored.append((
+                final, text_score, embed_cos, ctx_bonus, text_feats, ctx_feats, r
+            ))
+
+        scored.sort(key=lambda x: x[0], reverse=True)
+        top = []
+        for final, text_score, embed_cos, ctx_bonus, text_feats, ctx_feats, r in scored[:k]:
+            feats = {**{kk: round(v,6) for kk,v in text_feats.items()}, "embed_cos": round(embed_cos,6)}
+            top.append({
+                "entity_id": r["entity_id"],
+                "primary_name": r["primary_name"],
+                "score": round(final, 6),
+                "text_score": round(text_score, 6),
+                "context_bonus": round(ctx_bonus, 6),
+                "features": feats,
+                "context_features": ctx_feats,
+                "entity_type": r["entity_type"],
+                "programs": r["programs"],
+                "source": r["source"],
+                "dob": r["dob"],
+                "nationalities": r["nationalities"],
+                "ids": r["ids"],
+                "address": r["address"],
+            })
+
+        decision = "review"
+        if top:
+            best = top[0]["score"]
+            if best >= cfg.block_threshold: decision = "block"
+            elif best <= cfg.clear_threshold: decision = "clear"
+
+        results.append({"query": name, "context_used": context, "decision": decision, "top_hits": top})
+
+    return results
+
+def screen(
+    name: str,
+    k: int = 10,
+    db_path: str = "data/external/sanctions/kb.sqlite",
+    context: Optional[Dict[str, Any]] = None,
+    cfg: NameMatchConfig | None = None,
+    # optional FAISS inputs
+    faiss_index_path: Optional[str] = None,
+    faiss_ids_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    return screen_batch(
+        [name], k=k, db_path=db_path, contexts=[context], cfg=cfg,
+        faiss_index_path=faiss_index_path, faiss_ids_path=faiss_ids_path,
+    )[0]
@@ -1,20 +1,69 @@
+import hashlib
+import os
 import pandas as pd
-from .data_ingest import load_transactions, load_lexisnexis, join_txn_lexisnexis
+from .config import TXN_DTYPES
+from .data_ingest import (
+    load_transactions, load_lexisnexis, join_txn_lexisnexis,
+    _normalize_columns, _map_transactions_schema_if_needed,
+)
 from .models.isolation_forest import train_and_score
 from .evaluation import top_flags
 
+def _load_transactions_streamed(txn_path: str, max_rows: int | None, chunksize: int = 250_000) -> pd.DataFrame:
+    """Stream a transactions CSV in typed chunks; stops early when max_rows is set."""
+    parts = []
+    seen = 0
+    for chunk in pd.read_csv(txn_path, dtype=TXN_DTYPES, chunksize=chunksize):
+        chunk = _normalize_columns(chunk)
+        chunk = _map_transactions_schema_if_needed(chunk)
+        if max_rows is not None and seen + len(chunk) > max_rows:
+            chunk = chunk.iloc[: max_rows - seen]
+        parts.append(chunk)
+        seen += len(chunk)
+        if max_rows is not None and seen >= max_rows:
+            break
+    return pd.concat(parts, ignore_index=True)
+
+def _joined_cache_path(txn_path: str, ln_path: str, max_rows: int | None, cache_dir: str) -> str | None:
+    """Cache key from input file mtime+size, so edits to either input invalidate it."""
+    try:
+        sig = ":".join(
+            f"{os.path.getmtime(p)}:{os.path.getsize(p)}" for p in (txn_path, ln_path)
+        ) + f":{max_rows}"
+    except OSError:
+        return None
+    key = hashlib.sha1(sig.encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"joined_{key}.parquet")
+
 def run_pipeline(
     txn_path: str = None,
     ln_path: str = None,
     out_csv: str = "data/processed/flagged_transactions.csv",
     max_rows: int | None = None,
     random_state: int = 42,
+    cache_dir: str | None = "data/cache",
 ):
-    txn = load_transactions(txn_path)
-    ln = load_lexisnexis(ln_path)
-    if max_rows is not None and len(txn) > max_rows:
-        txn = txn.sample(n=max_rows, random_state=random_state)
-    joined = join_txn_lexisnexis(txn, ln)
+    # Skip CSV re-parse + re-join on repeat runs over unchanged inputs
+    cache_path = None
+    if cache_dir and txn_path and ln_path:
+        cache_path = _joined_cache_path(txn_path, ln_path, max_rows, cache_dir)
+    if cache_path and os.path.exists(cache_path):
+        joined = pd.read_parquet(cache_path, engine="pyarrow")
+    else:
+        if txn_path and txn_path.lower().endswith(".csv"):
+            txn = _load_transactions_streamed(txn_path, max_rows)
+        else:
+            txn = load_transactions(txn_path)
+        ln = load_lexisnexis(ln_path)
+        if max_rows is not None and len(txn) > max_rows:
+            txn = txn.sample(n=max_rows, random_state=random_state)
+        joined = join_txn_lexisnexis(txn, ln)
+        if cache_path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                joined.to_parquet(cache_path, engine="pyarrow", compression="zstd")
+            except (ImportError, OSError):
+                pass  # cache is best-effort; pyarrow may be absent
     scored, meta = train_and_score(joined)
     flagged = top_flags(scored, k=200)
     flagged.to_csv(out_csv, index=False)